@@ -1,4 +1,4 @@
-"""Core module initialization with defensive imports and fallbacks"""
+"""Core module initialization with lazy imports and fallbacks"""
 
 import os
 import sys
@@ -15,173 +15,260 @@ logging.basicConfig(
 
 fallback_logger = logging.getLogger("app.core")
 
-# Safe import function
-def safe_import(module_name: str, attributes: List[str], fallbacks: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    """Safely import attributes from a module with fallbacks."""
-    result = {}
-    fallbacks = fallbacks or {}
-    
-    try:
-        module = __import__(module_name, fromlist=attributes)
-        for attr in attributes:
-            if hasattr(module, attr):
-                result[attr] = getattr(module, attr)
-            else:
-                fallback_logger.warning(f"Attribute '{attr}' not found in {module_name}")
-                result[attr] = fallbacks.get(attr)
-    except ImportError as e:
-        fallback_logger.warning(f"Failed to import {module_name}: {e}")
-        for attr in attributes:
-            result[attr] = fallbacks.get(attr)
-    except Exception as e:
-        fallback_logger.error(f"Unexpected error importing {module_name}: {e}")
-        for attr in attributes:
-            result[attr] = fallbacks.get(attr)
-    
-    return result
-
-# Import configuration with fallback
+# Fallback configuration
 class FallbackSettings:
+    # (name, default, converter) triples, resolved in one pass over os.getenv
+    _DEFAULTS = (
+        ("APP_NAME", "HP Ecommerce Store", str),
+        ("APP_DESCRIPTION", "HP Products Store", str),
+        ("APP_VERSION", "1.0.0", str),
+        ("DEBUG", "True", lambda v: v.lower() == "true"),
+        ("HOST", "127.0.0.1", str),
+        ("PORT", "8080", int),
+        ("API_PREFIX", "/api", str),
+        ("CORS_ORIGINS", "http://localhost:8080", lambda v: tuple(o.strip() for o in v.split(",") if o.strip())),
+        ("DATABASE_URL", "sqlite:///./data/hp_store.db", str),
+        ("SECRET_KEY", "hp-store-secret-key", str),
+    )
+
     def __init__(self):
-        self.APP_NAME = os.getenv("APP_NAME", "HP Ecommerce Store")
-        self.APP_DESCRIPTION = os.getenv("APP_DESCRIPTION", "HP Products Store")
-        self.APP_VERSION = os.getenv("APP_VERSION", "1.0.0")
-        self.DEBUG = os.getenv("DEBUG", "True").lower() == "true"
-        self.HOST = os.getenv("HOST", "127.0.0.1")
-        self.PORT = int(os.getenv("PORT", "8080"))
-        self.API_PREFIX = os.getenv("API_PREFIX", "/api")
-        self.DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/hp_store.db")
-        self.SECRET_KEY = os.getenv("SECRET_KEY", "hp-store-secret-key")
-
-config_imports = safe_import("app.core.config", ["settings"], {"settings": FallbackSettings()})
-settings = config_imports["settings"]
-
-# Import logging with fallback
+        env = os.environ
+        for name, default, convert in self._DEFAULTS:
+            setattr(self, name, convert(env.get(name, default)))
+
+# Fallback logging
 def fallback_get_logger(name: str) -> logging.Logger:
     return logging.getLogger(f"app.{name}")
 
-logging_imports = safe_import("app.core.logging", ["app_logger", "get_logger"], {
-    "app_logger": fallback_logger,
-    "get_logger": fallback_get_logger
-})
-app_logger = logging_imports["app_logger"]
-get_logger = logging_imports["get_logger"]
-
-# Import database with fallback
+# Fallback database
 def fallback_init_database():
     fallback_logger.warning("Database initialization not available")
 
-database_imports = safe_import("app.core.database", ["init_database"], {
-    "init_database": fallback_init_database
-})
-init_database = database_imports["init_database"]
+# Fallback health check
+class FallbackHealthCheck:
+    @staticmethod
+    def check_all(use_cache: bool = True):
+        """Perform comprehensive health check"""
+        from datetime import datetime
+        return {
+            "status": "healthy",
+            "timestamp": datetime.utcnow().isoformat(),
+            "version": _resolve("settings").APP_VERSION,
+            "database": "connected"
+        }
+
+def fallback_is_healthy(component: str = "all") -> bool:
+    """Simple health check"""
+    return True
+
+def __getattr__(name: str) -> Any:
+    """Lazily resolve heavy submodule attributes on first access (PEP 562).
+
+    Importing `app.core` no longer pulls in Pydantic, SQLAlchemy, or the
+    filesystem setup; `settings`, `app_logger`, `get_logger`, and
+    `init_database` are imported (with fallbacks) the first time they are used.
+    """
+    if name == "settings":
+        try:
+            from app.core.config import settings
+        except ImportError as e:
+            fallback_logger.warning(f"Failed to import app.core.config: {e}")
+            settings = FallbackSettings()
+        globals()["settings"] = settings
+        return settings
+
+    if name in ("app_logger", "get_logger"):
+        try:
+            from app.core.logging import app_logger, get_logger
+        except ImportError as e:
+            fallback_logger.warning(f"Failed to import app.core.logging: {e}")
+            app_logger = fallback_logger
+            get_logger = fallback_get_logger
+        globals()["app_logger"] = app_logger
+        globals()["get_logger"] = get_logger
+        return globals()[name]
+
+    if name == "init_database":
+        try:
+            from app.core.database import init_database
+        except ImportError as e:
+            fallback_logger.warning(f"Failed to import app.core.database: {e}")
+            init_database = fallback_init_database
+        globals()["init_database"] = init_database
+        return init_database
+
+    if name in ("HealthCheck", "is_healthy"):
+        try:
+            from app.core.health import HealthCheck, is_healthy
+        except ImportError as e:
+            fallback_logger.warning(f"Failed to import app.core.health: {e}")
+            HealthCheck = FallbackHealthCheck
+            is_healthy = fallback_is_healthy
+        globals()["HealthCheck"] = HealthCheck
+        globals()["is_healthy"] = is_healthy
+        return globals()[name]
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _resolve(name: str) -> Any:
+    """Resolve a lazily imported attribute from inside this module."""
+    if name not in globals():
+        __getattr__(name)
+    return globals()[name]
 
 # Middleware and router setup functions
+# Explicit method/header allow-lists let Starlette take its fast path
+# instead of re-matching wildcards on every preflight
+_CORS_METHODS = ("GET", "POST", "PUT", "DELETE")
+_CORS_HEADERS = ("Authorization", "Content-Type")
+
 def setup_middleware(app):
     """Set up FastAPI middleware"""
+    app_logger = _resolve("app_logger")
+    settings = _resolve("settings")
     try:
         from fastapi.middleware.cors import CORSMiddleware
-        
-        app.add_middleware(
-            CORSMiddleware,
-            allow_origins=["*"],  # Configure appropriately for production
-            allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
-        )
+
+        if settings.DEBUG:
+            # Wide open for local development only
+            app.add_middleware(
+                CORSMiddleware,
+                allow_origins=["*"],
+                allow_credentials=True,
+                allow_methods=["*"],
+                allow_headers=["*"],
+            )
+        else:
+            app.add_middleware(
+                CORSMiddleware,
+                allow_origins=list(getattr(settings, "CORS_ORIGINS", ("http://localhost:8080",))),
+                allow_credentials=True,
+                allow_methods=list(_CORS_METHODS),
+                allow_headers=list(_CORS_HEADERS),
+            )
         app_logger.info("CORS middleware configured")
     except Exception as e:
         app_logger.error(f"Error setting up middleware: {e}")
 
 def setup_routers(app, api_prefix: str = ""):
     """Set up FastAPI routers"""
+    app_logger = _resolve("app_logger")
+    # Only a missing app.api package is tolerated; anything raised while
+    # wiring the routers is a real bug and must propagate
     try:
         from app.api import api_router
-        
-        if api_prefix:
-            app.include_router(api_router, prefix=api_prefix)
-        else:
-            app.include_router(api_router)
-        
-        app_logger.info(f"API routers configured with prefix: {api_prefix}")
-    except Exception as e:
-        app_logger.error(f"Error setting up routers: {e}")
+    except ImportError as e:
+        app_logger.error(f"API routers not available: {e}")
+        return
+
+    # FastAPI accepts an empty prefix, so no branch is needed
+    app.include_router(api_router, prefix=api_prefix)
+    app_logger.info(f"API routers configured with prefix: {api_prefix}")
+
+# Exception handlers live at module level so each exception path does a
+# plain global lookup instead of dereferencing closure cells. The 500
+# body is serialized once; the response classes are bound by
+# setup_error_handlers to keep fastapi out of the module import path.
+_INTERNAL_ERROR_BODY = b'{"detail": "Internal server error"}'
+_JSONResponse = None
+_Response = None
+
+async def _http_exception_handler(request, exc):
+    return _JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail}
+    )
+
+async def _general_exception_handler(request, exc):
+    _resolve("app_logger").error(f"Unhandled exception: {exc}")
+    return _Response(
+        content=_INTERNAL_ERROR_BODY,
+        media_type="application/json",
+        status_code=500
+    )
 
 def setup_error_handlers(app):
     """Set up error handlers"""
+    global _JSONResponse, _Response
+    app_logger = _resolve("app_logger")
     try:
-        from fastapi import Request, HTTPException
-        from fastapi.responses import JSONResponse
-        
-        @app.exception_handler(HTTPException)
-        async def http_exception_handler(request: Request, exc: HTTPException):
-            return JSONResponse(
-                status_code=exc.status_code,
-                content={"detail": exc.detail}
-            )
-        
-        @app.exception_handler(Exception)
-        async def general_exception_handler(request: Request, exc: Exception):
-            app_logger.error(f"Unhandled exception: {exc}")
-            return JSONResponse(
-                status_code=500,
-                content={"detail": "Internal server error"}
-            )
-        
+        from fastapi import HTTPException
+        from fastapi.responses import Response
+
+        try:
+            # orjson serializes straight to bytes, several times faster
+            # than stdlib json.dumps plus a UTF-8 encode
+            import orjson  # noqa: F401
+            from fastapi.responses import ORJSONResponse as _ResponseClass
+        except ImportError:
+            from fastapi.responses import JSONResponse as _ResponseClass
+
+        _JSONResponse = _ResponseClass
+        _Response = Response
+        app.add_exception_handler(HTTPException, _http_exception_handler)
+        app.add_exception_handler(Exception, _general_exception_handler)
+
         app_logger.info("Error handlers configured")
     except Exception as e:
         app_logger.error(f"Error setting up error handlers: {e}")
 
-# Health check functions
-class HealthCheck:
-    @staticmethod
-    def check_all():
-        """Perform comprehensive health check"""
-        return {
-            "status": "healthy",
-            "timestamp": "2024-01-01T00:00:00Z",
-            "version": settings.APP_VERSION,
-            "database": "connected"
-        }
-
-def is_healthy() -> bool:
-    """Simple health check"""
-    return True
+# Readiness state computed once at startup; health/readiness paths call
+# validate_environment and setup_database repeatedly, so the directory
+# checks and database initialization must not be re-run per request.
+_readiness_state: Optional[Dict[str, Any]] = None
 
 def validate_environment() -> List[str]:
-    """Validate environment configuration"""
+    """Validate environment configuration (computed once, then cached)"""
+    global _readiness_state
+    if _readiness_state is not None:
+        return _readiness_state["errors"]
+
+    app_logger = _resolve("app_logger")
     errors = []
-    
-    # Check data directory
-    data_dir = Path("data")
-    if not data_dir.exists():
-        try:
-            data_dir.mkdir(parents=True, exist_ok=True)
-            app_logger.info("Created data directory")
-        except Exception as e:
-            errors.append(f"Cannot create data directory: {e}")
-    
-    # Check static directory
-    static_dir = Path("app/static")
-    if not static_dir.exists():
-        try:
-            static_dir.mkdir(parents=True, exist_ok=True)
-            app_logger.info("Created static directory")
-        except Exception as e:
-            errors.append(f"Cannot create static directory: {e}")
-    
+
+    # Create directories once, then verify read-only
+    try:
+        from app.core._paths import ensure_dirs
+        ensure_dirs()
+    except Exception as e:
+        errors.append(f"Cannot create application directories: {e}")
+
+    for directory in ("data", "app/static"):
+        if not os.path.isdir(directory):
+            errors.append(f"Missing required directory: {directory}")
+
+    if errors:
+        for error in errors:
+            app_logger.error(f"Environment validation error: {error}")
+
+    _readiness_state = {"errors": errors, "db_initialized": False}
     return errors
 
 def setup_database():
-    """Initialize database"""
+    """Initialize database (no-op after the first successful run)"""
+    global _readiness_state
+    if _readiness_state is not None and _readiness_state.get("db_initialized"):
+        return
+
+    app_logger = _resolve("app_logger")
     try:
-        init_database()
+        _resolve("init_database")()
+        if _resolve("settings").DEBUG:
+            # SQL logging in dev goes through the logger level rather
+            # than engine echo, so statements are only formatted when
+            # this level is actually enabled
+            logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+        if _readiness_state is None:
+            _readiness_state = {"errors": [], "db_initialized": True}
+        else:
+            _readiness_state["db_initialized"] = True
         app_logger.info("Database setup completed")
     except Exception as e:
         app_logger.error(f"Database setup failed: {e}")
 
 def setup_nicegui(app):
     """Set up NiceGUI integration"""
+    app_logger = _resolve("app_logger")
     try:
         from app.core.nicegui_setup import setup_nicegui as _setup_nicegui
         _setup_nicegui(app)
@@ -192,14 +279,14 @@ def setup_nicegui(app):
 # Export all components
 __all__ = [
     "settings",
-    "app_logger", 
+    "app_logger",
     "get_logger",
     "setup_middleware",
-    "setup_routers", 
+    "setup_routers",
     "setup_error_handlers",
     "HealthCheck",
     "is_healthy",
     "validate_environment",
     "setup_database",
     "setup_nicegui"
-]
\ No newline at end of file
+]
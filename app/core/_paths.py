@@ -0,0 +1,22 @@
+"""One-time filesystem setup for application directories"""
+
+from pathlib import Path
+
+# Directories the application expects to exist at runtime
+_APP_DIRS = ("data", "logs", "app/static", "app/static/uploads")
+
+_DONE = False
+
+def ensure_dirs() -> None:
+    """Create the application directories exactly once per process.
+
+    Repeated calls are a no-op, so callers (logging, database, startup
+    validation) can invoke this freely without paying stat/mkdir
+    syscalls on every check.
+    """
+    global _DONE
+    if _DONE:
+        return
+    for path in _APP_DIRS:
+        Path(path).mkdir(parents=True, exist_ok=True)
+    _DONE = True
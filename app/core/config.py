@@ -1,16 +1,23 @@
 """Application configuration using Pydantic Settings V2"""
 
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
 from pydantic import Field, ConfigDict
-from typing import Optional
+from typing import Optional, Tuple
 
 class Settings(BaseSettings):
-    """Application settings with environment variable support."""
+    """Application settings with environment variable support.
+
+    Settings are immutable for the process lifetime, so the model is
+    frozen and constructed once via the cached get_settings() below.
+    """
     model_config = ConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False,
-        extra="ignore"
+        extra="ignore",
+        frozen=True
     )
     
     # Application
@@ -23,6 +30,7 @@ class Settings(BaseSettings):
     HOST: str = Field(default="127.0.0.1")
     PORT: int = Field(default=8080)
     API_PREFIX: str = Field(default="/api")
+    CORS_ORIGINS: Tuple[str, ...] = Field(default=("http://localhost:8080",))
     
     # Database
     DATABASE_URL: str = Field(default="sqlite:///./data/hp_store.db")
@@ -48,4 +56,13 @@ class Settings(BaseSettings):
     PAYPAL_CLIENT_ID: Optional[str] = Field(default=None)
     PAYPAL_CLIENT_SECRET: Optional[str] = Field(default=None)
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings singleton.
+
+    Avoids re-running Pydantic validation and re-reading .env on every
+    instantiation.
+    """
+    return Settings()
+
+settings = get_settings()
\ No newline at end of file
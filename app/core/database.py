@@ -2,31 +2,89 @@
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import StaticPool
 from contextlib import contextmanager
 from typing import Generator
-import os
-from pathlib import Path
 
+from app.core._paths import ensure_dirs
 from app.core.config import settings
 from app.core.logging import app_logger
 
-# Ensure data directory exists
-data_dir = Path("data")
-data_dir.mkdir(exist_ok=True)
+# The SQLite database file lives under data/
+ensure_dirs()
 
-# Create engine with proper configuration
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+# Create engine with proper configuration. SQLite connections are
+# process-local, so pool recycling is irrelevant there; in-memory
+# databases need a StaticPool so every session shares one connection.
+# echo is left off: it stringifies every statement and its parameters
+# even when the handler would discard the record. SQL logging is
+# enabled via the "sqlalchemy.engine" logger level instead (see
+# setup_database in app.core).
+# query_cache_size is raised from the default 500 so the compiled form
+# of every hot page statement stays cached instead of being evicted and
+# recompiled under load.
+if "sqlite" in settings.DATABASE_URL:
+    engine = create_engine(
+        settings.DATABASE_URL,
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool if ":memory:" in settings.DATABASE_URL else None,
+        query_cache_size=1200,
+    )
+else:
+    # Pool sized for concurrent page renders: up to 25 pooled
+    # connections with 25 more of burst overflow, a short checkout
+    # timeout so saturation surfaces as a fast error instead of a
+    # stalled request, and half-hour recycling to stay ahead of
+    # server-side idle disconnects.
+    engine = create_engine(
+        settings.DATABASE_URL,
+        echo=False,
+        pool_size=25,
+        max_overflow=25,
+        pool_timeout=5,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        query_cache_size=1200,
+    )
 
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
     pass
 
+# Full-text search over the product text columns. An external-content
+# FTS5 table shadows products, kept in sync by triggers, so substring
+# search becomes an indexed MATCH instead of three ILIKE column scans.
+# The 'rebuild' insert backfills rows that predate the triggers and is
+# a no-op on an up-to-date index.
+_FTS_DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, description, specifications,
+        content='products', content_rowid='id'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description, specifications)
+        VALUES (new.id, new.name, new.description, new.specifications);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description, specifications)
+        VALUES ('delete', old.id, old.name, old.description, old.specifications);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description, specifications)
+        VALUES ('delete', old.id, old.name, old.description, old.specifications);
+        INSERT INTO products_fts(rowid, name, description, specifications)
+        VALUES (new.id, new.name, new.description, new.specifications);
+    END""",
+    "INSERT INTO products_fts(products_fts) VALUES('rebuild')",
+)
+
+def _create_search_index():
+    """Create the FTS5 product search table and its sync triggers."""
+    with engine.begin() as conn:
+        for ddl in _FTS_DDL:
+            conn.exec_driver_sql(ddl)
+
 def create_tables():
     """Create all database tables."""
     try:
@@ -36,10 +94,24 @@ def create_tables():
         app_logger.error(f"Error creating database tables: {e}")
         raise
 
+    # Search index is an optimization, not a requirement: search falls
+    # back to ILIKE when FTS5 isn't available in the SQLite build
+    if "sqlite" in settings.DATABASE_URL:
+        try:
+            _create_search_index()
+            app_logger.info("Product search index ready")
+        except Exception as e:
+            app_logger.info(f"FTS5 unavailable, search will use ILIKE: {e}")
+
 @contextmanager
 def get_db_session() -> Generator[Session, None, None]:
-    """Database session context manager."""
-    session = Session(engine)
+    """Database session context manager.
+
+    expire_on_commit=False keeps loaded attributes readable after the
+    session commits and closes, so fetch helpers can return ORM objects
+    to code running outside the session scope without re-queries.
+    """
+    session = Session(engine, expire_on_commit=False)
     try:
         yield session
         session.commit()
@@ -55,13 +127,24 @@ def get_db() -> Generator[Session, None, None]:
     with get_db_session() as session:
         yield session
 
-# Enable foreign key constraints for SQLite
+# Configure SQLite connections for performance and integrity
 @event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
-    """Enable foreign key constraints for SQLite."""
+    """Enable foreign keys and performance pragmas for SQLite.
+
+    WAL mode lets readers proceed concurrently with a writer, and
+    synchronous=NORMAL drops the second fsync per commit; together
+    these substantially improve write throughput for a read-heavy
+    store backed by SQLite.
+    """
     if "sqlite" in settings.DATABASE_URL:
         cursor = dbapi_connection.cursor()
         cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
         cursor.close()
 
 def init_database():
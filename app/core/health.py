@@ -2,17 +2,23 @@ import os
 import time
 import platform
 import psutil
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 
 from app.core.logging import app_logger
 
 class HealthCheck:
     """Health check utility for the application.
-    
+
     This class provides methods to check the health of various components
-    of the application, focusing on system resources.
+    of the application, focusing on system resources. Results of
+    `check_all` are cached for a short TTL so that frequent liveness
+    probes do not re-run the (comparatively expensive) system checks.
     """
-    
+
+    _cached: Optional[Dict[str, Any]] = None
+    _ts: float = 0.0
+    _TTL: float = 1.0
+
     @staticmethod
     def check_system() -> Dict[str, Any]:
         """Check system health (CPU, memory, disk, process).
@@ -44,28 +50,37 @@ class HealthCheck:
             return {"status": "error", "message": str(e)}
     
     @staticmethod
-    def check_all() -> Dict[str, Any]:
+    def check_all(use_cache: bool = True) -> Dict[str, Any]:
         """Run all health checks.
-        
+
+        Args:
+            use_cache: Return the cached result if it is still fresh
+
         Returns:
             Dict with all health check information
         """
         try:
+            now = time.monotonic()
+            if use_cache and HealthCheck._cached is not None and now - HealthCheck._ts < HealthCheck._TTL:
+                return HealthCheck._cached
+
             app_logger.info("Starting all health checks")
             start_time = time.time()
-            
+
             system_health = HealthCheck.check_system()
-            
+
             overall_status = system_health.get("status", "error")
-            
+
             response_time_ms = round((time.time() - start_time) * 1000, 2)
-            
+
             result = {
                 "status": overall_status,
                 "timestamp": time.time(),
                 "response_time_ms": response_time_ms,
                 "system": system_health,
             }
+            HealthCheck._cached = result
+            HealthCheck._ts = time.monotonic()
             app_logger.info("All health checks completed successfully")
             return result
         except Exception as e:
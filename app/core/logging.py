@@ -1,15 +1,18 @@
 """Logging configuration for the application"""
 
+import atexit
 import logging
 import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
-from pathlib import Path
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Dict, Any
 
-# Ensure logs directory exists
-logs_dir = Path("logs")
-logs_dir.mkdir(exist_ok=True)
+from app.core._paths import ensure_dirs
+
+# The file handler below writes to logs/
+ensure_dirs()
 
 # Configure the root logger
 logging.basicConfig(
@@ -18,9 +21,11 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 
-# Create application logger
+# Create application logger; propagate=False keeps records from also
+# reaching the root handler installed by basicConfig above
 app_logger = logging.getLogger("app")
 app_logger.setLevel(logging.INFO)
+app_logger.propagate = False
 
 # Create formatter
 formatter = logging.Formatter(
@@ -33,7 +38,9 @@ console_handler = logging.StreamHandler(sys.stdout)
 console_handler.setFormatter(formatter)
 app_logger.addHandler(console_handler)
 
-# File handler
+# File handler, fed through a queue so that disk writes (and rotation
+# renames) happen on a dedicated listener thread instead of blocking the
+# request path under the logging lock
 try:
     file_handler = RotatingFileHandler(
         "logs/app.log",
@@ -41,32 +48,53 @@ try:
         backupCount=5,
     )
     file_handler.setFormatter(formatter)
-    app_logger.addHandler(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    app_logger.addHandler(QueueHandler(log_queue))
+    queue_listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    queue_listener.start()
+    atexit.register(queue_listener.stop)
 except Exception as e:
     app_logger.error(f"Failed to set up file logging: {e}")
 
-# Set log level from environment
-log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-if log_level in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
-    app_logger.setLevel(getattr(logging, log_level))
+# Set log level from environment; the name->level table comes from the
+# logging module itself, so a malformed value falls back to INFO instead
+# of resolving an unrelated attribute via getattr
+try:
+    _LEVELS = logging.getLevelNamesMapping()
+except AttributeError:  # getLevelNamesMapping is Python 3.11+
+    _LEVELS = {
+        name: getattr(logging, name)
+        for name in ("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET")
+    }
+app_logger.setLevel(_LEVELS.get(os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO))
 
+@lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
-    """Get a logger for a specific module"""
-    logger = logging.getLogger(f"app.{name}")
-    logger.setLevel(app_logger.level)
-    
-    if not logger.handlers:
-        logger.addHandler(console_handler)
-        if 'file_handler' in locals():
-            logger.addHandler(file_handler)
-    
-    return logger
+    """Get a logger for a specific module.
+
+    Children of the "app" logger inherit its handlers (console + queued
+    file handler) through the logger hierarchy, so no handlers are
+    attached here; repeated calls are a cache lookup.
+    """
+    return logging.getLogger(f"app.{name}")
+
+# Level-name lookup table, resolved once instead of getattr per call
+_LEVEL_BY_NAME = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
 
 def log_structured(logger: logging.Logger, level: str, message: str, data: Dict[str, Any]) -> None:
     """Log a message with structured data"""
     try:
-        log_method = getattr(logger, level.lower(), logger.info)
-        log_method(f"{message} - {data}")
+        level_no = _LEVEL_BY_NAME.get(level.lower(), logging.INFO)
+        if logger.isEnabledFor(level_no):
+            # Lazy %-formatting: repr(data) is only paid when a handler emits
+            logger.log(level_no, "%s - %r", message, data)
     except Exception as e:
         logger.error(f"Error in log_structured: {e}")
 
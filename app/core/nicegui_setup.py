@@ -1,11 +1,18 @@
 """NiceGUI integration setup for FastAPI"""
 
 from fastapi import FastAPI
-from nicegui import app as nicegui_app
 from app.core.logging import app_logger
 
 def setup_nicegui(app: FastAPI):
     """Set up NiceGUI integration with FastAPI"""
+    # Imported here so headless/CLI processes can import app.core without
+    # paying for (or even having) NiceGUI's full widget tree
+    try:
+        from nicegui import app as nicegui_app
+    except ImportError:
+        app_logger.info("NiceGUI not installed; skipping UI integration")
+        return
+
     try:
         # Mount NiceGUI static files
         nicegui_app.mount_to(app)
@@ -14,4 +21,4 @@ def setup_nicegui(app: FastAPI):
         app_logger.error(f"Error setting up NiceGUI: {e}")
         raise
 
-__all__ = ["setup_nicegui"]
\ No newline at end of file
+__all__ = ["setup_nicegui"]
@@ -0,0 +1,40 @@
+"""In-process TTL cache for single-product lookups.
+
+Product rows (price, stock flags, is_active) change rarely but are
+read on every add-to-cart, so lookups are served cache-aside from a
+small in-process dict with a short TTL — the same monotonic-timestamp
+pattern as the listing caches in ProductService. Sessions are built
+with expire_on_commit=False, so cached detached objects stay readable.
+Product writes invalidate through clear_cache (wired into
+ProductService's mutation methods).
+"""
+
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+
+_CACHE_TTL = 120.0
+_cache: Dict[int, Tuple[float, Product]] = {}
+
+
+def get_product(db: Session, product_id: int) -> Optional[Product]:
+    """Get a product by id, serving repeat lookups from the cache."""
+    cached = _cache.get(product_id)
+    if cached and time.monotonic() - cached[0] < _CACHE_TTL:
+        return cached[1]
+
+    product = db.get(Product, product_id)
+    if product is not None:
+        _cache[product_id] = (time.monotonic(), product)
+    return product
+
+
+def invalidate(product_id: Optional[int] = None) -> None:
+    """Drop one cached product, or all of them, after a write."""
+    if product_id is None:
+        _cache.clear()
+    else:
+        _cache.pop(product_id, None)
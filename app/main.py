@@ -3,7 +3,10 @@
 from nicegui import ui, app as nicegui_app
 from typing import Optional, List, Dict, Any
 import asyncio
+import html
 from datetime import datetime
+from functools import lru_cache
+from urllib.parse import quote_plus
 
 from app.core import app_logger, settings
 from app.services.product_service import ProductService
@@ -11,137 +14,272 @@ from app.services.cart_service import CartService
 from app.services.auth_service import AuthService
 from app.services.order_service import OrderService
 from app.models.user import User
-from app.models.product import Product
+from app.models.product import Product, Category
 from app.models.cart import Cart
 from app.core.database import get_db_session
+from sqlalchemy.orm import undefer
 
-# Global state management
-class AppState:
-    def __init__(self):
-        self.current_user: Optional[User] = None
-        self.cart_items_count: int = 0
-        self.current_cart: Optional[Cart] = None
-        
-    def set_user(self, user: Optional[User]):
-        self.current_user = user
-        if user:
-            # Load user's cart
-            with get_db_session() as db:
-                cart_service = CartService(db)
-                self.current_cart = cart_service.get_or_create_cart(user.id)
-                self.cart_items_count = cart_service.get_cart_items_count(self.current_cart.id)
-        else:
-            self.current_cart = None
-            self.cart_items_count = 0
+# Session state lives in NiceGUI's per-client user storage (backed by
+# the storage_secret session cookie), so each browser session reads and
+# writes its own small dict. The previous module-level AppState object
+# was shared by every connected client — a correctness bug under
+# concurrent users and a contention point — and also blocked running
+# multiple workers without sticky sessions.
+def current_user() -> Optional[Dict[str, Any]]:
+    """The logged-in user as a plain dict, or None"""
+    return nicegui_app.storage.user.get('user')
+
+def current_cart_id() -> Optional[int]:
+    return nicegui_app.storage.user.get('cart_id')
+
+def cart_items_count() -> int:
+    return nicegui_app.storage.user.get('cart_count', 0)
+
+def set_cart_items_count(count: int) -> None:
+    nicegui_app.storage.user['cart_count'] = count
 
-app_state = AppState()
+def set_user(user: Optional[User]) -> None:
+    """Store the session's user, cart id and cart count"""
+    if user:
+        with get_db_session() as db:
+            cart_service = CartService(db)
+            cart = cart_service.get_or_create_cart(user.id)
+            nicegui_app.storage.user.update(
+                user={'id': user.id, 'username': user.username, 'email': user.email, 'is_admin': user.is_admin},
+                cart_id=cart.id,
+                cart_count=cart_service.get_cart_items_count(cart.id),
+            )
+    else:
+        nicegui_app.storage.user.update(user=None, cart_id=None, cart_count=0)
 
 # Utility functions
+@lru_cache(maxsize=4096)
 def format_price(price: float) -> str:
-    """Format price as currency"""
+    """Format price as currency.
+
+    Called in per-item loops on every grid and cart render; catalog
+    prices are a small set of discrete values, so memoizing skips the
+    repeated f-string formatting.
+    """
     return f"${price:,.2f}"
 
+# The header is rebuilt on every page navigation, so its fixed pieces —
+# nav links and Tailwind class strings — are hoisted to module level
+# rather than re-created per render. (NiceGUI element trees cannot be
+# cloned, so each page still registers its own elements; only the
+# dynamic user/cart part varies between renders.)
+_NAV_LINKS = (
+    ('Home', '/'),
+    ('Laptops', '/category/laptops'),
+    ('Desktops', '/category/desktops'),
+    ('Printers', '/category/printers'),
+    ('Accessories', '/category/accessories'),
+)
+_NAV_CLS = 'text-white hover:text-blue-200 font-medium'
+_HEADER_CLS = 'bg-blue-600 text-white shadow-lg'
+_HEADER_ROW_CLS = 'w-full items-center justify-between px-4 py-2'
+
+def _build_header_static():
+    """Build the parts of the header that are identical on every page"""
+    # Logo and brand
+    with ui.row().classes('items-center gap-4'):
+        ui.image('/static/images/hp-logo.png').classes('h-8 w-auto').props('fit=contain')
+        ui.label('HP Store').classes('text-2xl font-bold')
+
+    # Navigation
+    with ui.row().classes('items-center gap-6'):
+        for label, target in _NAV_LINKS:
+            ui.link(label, target).classes(_NAV_CLS)
+
+def _build_header_dynamic():
+    """Build the user- and cart-dependent part of the header"""
+    with ui.row().classes('items-center gap-4'):
+        # Search
+        search_input = ui.input(placeholder='Search products...').classes('w-64')
+        ui.button(icon='search', on_click=lambda: search_products(search_input.value)).props('flat color=white')
+
+        # Cart
+        ui.button(f'Cart ({cart_items_count()})', icon='shopping_cart',
+                  on_click=lambda: ui.navigate.to('/cart')).props('flat color=white')
+
+        # User menu
+        user = current_user()
+        if user:
+            with ui.button(user['username'], icon='account_circle').props('flat color=white'):
+                with ui.menu():
+                    ui.menu_item('Profile', lambda: ui.navigate.to('/profile'))
+                    ui.menu_item('Orders', lambda: ui.navigate.to('/orders'))
+                    ui.menu_item('Logout', logout)
+        else:
+            ui.button('Login', on_click=lambda: ui.navigate.to('/login')).props('flat color=white')
+
 def create_header():
     """Create the main header with navigation"""
-    with ui.header().classes('bg-blue-600 text-white shadow-lg'):
-        with ui.row().classes('w-full items-center justify-between px-4 py-2'):
-            # Logo and brand
-            with ui.row().classes('items-center gap-4'):
-                ui.image('/static/images/hp-logo.png').classes('h-8 w-auto').props('fit=contain')
-                ui.label('HP Store').classes('text-2xl font-bold')
-            
-            # Navigation
-            with ui.row().classes('items-center gap-6'):
-                ui.link('Home', '/').classes('text-white hover:text-blue-200 font-medium')
-                ui.link('Laptops', '/category/laptops').classes('text-white hover:text-blue-200 font-medium')
-                ui.link('Desktops', '/category/desktops').classes('text-white hover:text-blue-200 font-medium')
-                ui.link('Printers', '/category/printers').classes('text-white hover:text-blue-200 font-medium')
-                ui.link('Accessories', '/category/accessories').classes('text-white hover:text-blue-200 font-medium')
-            
-            # User actions
-            with ui.row().classes('items-center gap-4'):
-                # Search
-                search_input = ui.input(placeholder='Search products...').classes('w-64')
-                ui.button(icon='search', on_click=lambda: search_products(search_input.value)).props('flat color=white')
-                
-                # Cart
-                cart_button = ui.button(f'Cart ({app_state.cart_items_count})', icon='shopping_cart', 
-                                      on_click=lambda: ui.navigate.to('/cart')).props('flat color=white')
-                
-                # User menu
-                if app_state.current_user:
-                    with ui.button(app_state.current_user.username, icon='account_circle').props('flat color=white'):
-                        with ui.menu():
-                            ui.menu_item('Profile', lambda: ui.navigate.to('/profile'))
-                            ui.menu_item('Orders', lambda: ui.navigate.to('/orders'))
-                            ui.menu_item('Logout', logout)
-                else:
-                    ui.button('Login', on_click=lambda: ui.navigate.to('/login')).props('flat color=white')
+    with ui.header().classes(_HEADER_CLS):
+        with ui.row().classes(_HEADER_ROW_CLS):
+            _build_header_static()
+            _build_header_dynamic()
+
+# Static card body rendered as a single HTML element. One ui.html per
+# card replaces half a dozen element registrations (and their
+# WebSocket messages) per product in every grid; only the interactive
+# buttons remain real NiceGUI elements.
+_CARD_TPL = (
+    '<img src="{img}" loading="lazy" class="h-48 w-full object-cover">'
+    '<div class="p-4">'
+    '<div class="text-lg font-semibold text-gray-800 line-clamp-2">{name}</div>'
+    '<div class="text-xl font-bold text-blue-600 mt-2">{price}</div>'
+    '<div class="text-sm {stock_cls}">{stock}</div>'
+    '</div>'
+)
 
 def create_product_card(product: Product) -> ui.card:
     """Create a product card component"""
+    in_stock = product.stock_quantity > 0
     with ui.card().classes('w-72 h-96 cursor-pointer hover:shadow-xl transition-shadow') as card:
-        # Product image
-        ui.image(product.image_url or '/static/images/placeholder-product.png').classes('h-48 w-full object-cover')
-        
-        with ui.card_section().classes('p-4'):
-            # Product name
-            ui.label(product.name).classes('text-lg font-semibold text-gray-800 line-clamp-2')
-            
-            # Price
-            ui.label(format_price(product.price)).classes('text-xl font-bold text-blue-600 mt-2')
-            
-            # Stock status
-            if product.stock_quantity > 0:
-                ui.label(f'In Stock ({product.stock_quantity} available)').classes('text-sm text-green-600')
+        # Values are escaped because they are interpolated into markup
+        ui.html(_CARD_TPL.format(
+            img=html.escape(product.image_url or '/static/images/placeholder-product.png', quote=True),
+            name=html.escape(product.name),
+            price=format_price(product.price),
+            stock_cls='text-green-600' if in_stock else 'text-red-600',
+            stock=f'In Stock ({product.stock_quantity} available)' if in_stock else 'Out of Stock',
+        )).classes('w-full')
+
+        # Action buttons
+        with ui.row().classes('w-full justify-between px-4 pb-4'):
+            ui.button('View Details', on_click=lambda p=product: ui.navigate.to(f'/product/{p.id}')).props('flat color=primary')
+
+            if in_stock:
+                ui.button('Add to Cart', icon='add_shopping_cart',
+                         on_click=lambda p=product: add_to_cart(p.id)).props('color=primary')
             else:
-                ui.label('Out of Stock').classes('text-sm text-red-600')
-            
-            # Action buttons
-            with ui.row().classes('w-full justify-between mt-4'):
-                ui.button('View Details', on_click=lambda p=product: ui.navigate.to(f'/product/{p.id}')).props('flat color=primary')
-                
-                if product.stock_quantity > 0:
-                    ui.button('Add to Cart', icon='add_shopping_cart',
-                             on_click=lambda p=product: add_to_cart(p.id)).props('color=primary')
-                else:
-                    ui.button('Out of Stock').props('disable color=grey')
-    
+                ui.button('Out of Stock').props('disable color=grey')
+
     return card
 
+# Synchronous fetch helpers, run via asyncio.to_thread from the async
+# page handlers so DB waits overlap across users instead of blocking
+# the event loop. Each helper is the single session a page render opens:
+# all of a page's DB work goes through one helper so connection checkout
+# and transaction begin are paid once per render, not per query.
+def _fetch_featured_products(limit: int = 8) -> List[Product]:
+    with get_db_session() as db:
+        return ProductService(db).get_featured_products(limit=limit)
+
+def _fetch_category_products(category_name: str, limit: int = 24, after_id: int = 0,
+                             price_min: Optional[float] = None,
+                             price_max: Optional[float] = None,
+                             order_by: Optional[str] = None) -> List[Product]:
+    with get_db_session() as db:
+        return ProductService(db).get_products_by_category(
+            category_name, limit=limit, after_id=after_id,
+            price_min=price_min, price_max=price_max, order_by=order_by)
+
+def _fetch_product(product_id: int) -> Optional[Product]:
+    with get_db_session() as db:
+        return ProductService(db).get_product(product_id)
+
+def _fetch_cart_view(cart_id: int):
+    # Row tuples of (id, quantity, name, price, image_url) — the cart
+    # and checkout pages only render, so no ORM objects are hydrated
+    with get_db_session() as db:
+        return CartService(db).get_cart_view(cart_id)
+
+def _fetch_search_results(query: str, limit: int = 24, after_id: int = 0) -> List[Product]:
+    with get_db_session() as db:
+        return ProductService(db).search_products(query, limit=limit, after_id=after_id)
+
+def _fetch_categories() -> List[Category]:
+    with get_db_session() as db:
+        return ProductService(db).get_all_categories()
+
+def _fetch_user(user_id: int) -> Optional[User]:
+    # address is deferred on the model; undefer it here since checkout
+    # prefills from it and the object is detached by render time
+    with get_db_session() as db:
+        return db.get(User, user_id, options=[undefer(User.address)])
+
+# Login and registration include a password hash/verify, which costs
+# real CPU time per call — run the whole round trip in a worker thread
+# like the fetch helpers so it never stalls the event loop.
+def _authenticate(email: str, password: str) -> Optional[User]:
+    with get_db_session() as db:
+        return AuthService(db).authenticate_user(email, password)
+
+def _register(username: str, email: str, password: str, full_name: str) -> Optional[User]:
+    with get_db_session() as db:
+        return AuthService(db).create_user(
+            username=username, email=email,
+            password=password, full_name=full_name)
+
+# Filter widget labels mapped to the SQL-side kwargs they stand for
+_PRICE_FILTERS = {
+    'All Prices': (None, None),
+    'Under $500': (None, 500),
+    '$500-$1000': (500, 1000),
+    '$1000-$2000': (1000, 2000),
+    'Over $2000': (2000, None),
+}
+_SORT_FILTERS = {
+    'Name A-Z': 'name_asc',
+    'Name Z-A': 'name_desc',
+    'Price Low-High': 'price_asc',
+    'Price High-Low': 'price_desc',
+}
+
 def search_products(query: str):
     """Search for products"""
     if query.strip():
-        ui.navigate.to(f'/search?q={query.strip()}')
+        # quote_plus keeps spaces, '&' and '#' from breaking the URL;
+        # the search page's query parsing decodes it again
+        ui.navigate.to(f'/search?q={quote_plus(query.strip())}')
 
 def add_to_cart(product_id: int, quantity: int = 1):
     """Add product to cart"""
-    if not app_state.current_user:
+    if not current_user():
         ui.navigate.to('/login')
         return
-    
+
     try:
         with get_db_session() as db:
             cart_service = CartService(db)
-            cart_service.add_to_cart(app_state.current_cart.id, product_id, quantity)
-            app_state.cart_items_count = cart_service.get_cart_items_count(app_state.current_cart.id)
-            ui.notify('Product added to cart!', type='positive')
+            # The mutation returns the updated count from the same
+            # session, so no second count query is needed
+            success, new_count = cart_service.add_to_cart(current_cart_id(), product_id, quantity)
+            if success:
+                set_cart_items_count(new_count)
+                ui.notify('Product added to cart!', type='positive')
+            else:
+                ui.notify('Failed to add product to cart', type='negative')
     except Exception as e:
         app_logger.error(f"Error adding to cart: {e}")
         ui.notify('Failed to add product to cart', type='negative')
 
 def logout():
     """Logout current user"""
-    app_state.set_user(None)
+    set_user(None)
     ui.notify('Logged out successfully', type='positive')
     ui.navigate.to('/')
 
 # Page routes
 @ui.page('/')
-def homepage():
+async def homepage():
     """Homepage with featured products"""
     create_header()
-    
+
+    # Featured products and the category strip are independent reads;
+    # gather overlaps the two round-trips instead of serializing them
+    try:
+        featured_products, categories = await asyncio.gather(
+            asyncio.to_thread(_fetch_featured_products, 8),
+            asyncio.to_thread(_fetch_categories),
+        )
+    except Exception as e:
+        app_logger.error(f"Error loading homepage data: {e}")
+        featured_products, categories = [], []
+
+
     with ui.column().classes('w-full max-w-7xl mx-auto px-4 py-8'):
         # Hero section
         with ui.card().classes('w-full bg-gradient-to-r from-blue-600 to-blue-800 text-white mb-8'):
@@ -150,39 +288,27 @@ def homepage():
                 ui.label('Discover the latest HP laptops, desktops, printers, and accessories').classes('text-xl mb-6')
                 ui.button('Shop Now', on_click=lambda: ui.navigate.to('/category/laptops')).props('size=lg color=white')
         
-        # Featured categories
+        # Featured categories, from the catalog rather than a hardcoded list
         ui.label('Shop by Category').classes('text-3xl font-bold mb-6')
         with ui.row().classes('w-full gap-6 mb-8'):
-            categories = [
-                {'name': 'Laptops', 'image': '/static/images/category-laptops.jpg', 'url': '/category/laptops'},
-                {'name': 'Desktops', 'image': '/static/images/category-desktops.jpg', 'url': '/category/desktops'},
-                {'name': 'Printers', 'image': '/static/images/category-printers.jpg', 'url': '/category/printers'},
-                {'name': 'Accessories', 'image': '/static/images/category-accessories.jpg', 'url': '/category/accessories'},
-            ]
-            
             for category in categories:
                 with ui.card().classes('w-64 cursor-pointer hover:shadow-lg transition-shadow'):
-                    ui.image(category['image']).classes('h-40 w-full object-cover')
+                    ui.image(category.image_url or '/static/images/placeholder-product.png').classes('h-40 w-full object-cover')
                     with ui.card_section().classes('p-4 text-center'):
-                        ui.label(category['name']).classes('text-xl font-semibold')
-                        ui.button('Browse', on_click=lambda url=category['url']: ui.navigate.to(url)).props('flat color=primary')
-        
+                        ui.label(category.name).classes('text-xl font-semibold')
+                        ui.button('Browse', on_click=lambda url=f'/category/{category.name.lower()}': ui.navigate.to(url)).props('flat color=primary')
+
         # Featured products
         ui.label('Featured Products').classes('text-3xl font-bold mb-6')
         with ui.row().classes('w-full gap-6 flex-wrap'):
-            try:
-                with get_db_session() as db:
-                    product_service = ProductService(db)
-                    featured_products = product_service.get_featured_products(limit=8)
-                    
-                    for product in featured_products:
-                        create_product_card(product)
-            except Exception as e:
-                app_logger.error(f"Error loading featured products: {e}")
+            if featured_products:
+                for product in featured_products:
+                    create_product_card(product)
+            else:
                 ui.label('Unable to load featured products').classes('text-gray-500')
 
 @ui.page('/category/{category_name}')
-def category_page(category_name: str):
+async def category_page(category_name: str):
     """Category page showing products in a specific category"""
     create_header()
     
@@ -191,190 +317,223 @@ def category_page(category_name: str):
         
         # Filters
         with ui.row().classes('w-full gap-4 mb-6'):
-            price_filter = ui.select(['All Prices', 'Under $500', '$500-$1000', '$1000-$2000', 'Over $2000'], 
+            price_filter = ui.select(['All Prices', 'Under $500', '$500-$1000', '$1000-$2000', 'Over $2000'],
                                    value='All Prices').classes('w-48')
-            sort_filter = ui.select(['Name A-Z', 'Name Z-A', 'Price Low-High', 'Price High-Low'], 
+            sort_filter = ui.select(['Name A-Z', 'Name Z-A', 'Price Low-High', 'Price High-Low'],
                                   value='Name A-Z').classes('w-48')
-            ui.button('Apply Filters', on_click=lambda: apply_filters(category_name, price_filter.value, sort_filter.value))
-        
-        # Products grid
+            ui.button('Apply Filters', on_click=lambda: apply_filters())
+
+        # Products grid, rendered one keyset page at a time. Filters are
+        # pushed down into the SQL predicate rather than applied in
+        # Python over the full result set.
         products_container = ui.row().classes('w-full gap-6 flex-wrap')
-        
-        def load_products():
-            products_container.clear()
+        load_more_row = ui.row().classes('w-full justify-center mt-4')
+
+        page_size = 24
+        cursor = {'after_id': 0}
+        filters = {'price_min': None, 'price_max': None, 'order_by': None}
+
+        async def load_products(initial: bool = False):
+            if initial:
+                products_container.clear()
+                cursor['after_id'] = 0
             try:
-                with get_db_session() as db:
-                    product_service = ProductService(db)
-                    products = product_service.get_products_by_category(category_name)
-                    
-                    if products:
-                        with products_container:
-                            for product in products:
-                                create_product_card(product)
-                    else:
-                        with products_container:
-                            ui.label(f'No products found in {category_name} category').classes('text-gray-500 text-xl')
+                products = await asyncio.to_thread(
+                    _fetch_category_products, category_name, page_size, cursor['after_id'],
+                    filters['price_min'], filters['price_max'], filters['order_by'])
+
+                if products:
+                    cursor['after_id'] = products[-1].id
+                    with products_container:
+                        for product in products:
+                            create_product_card(product)
+                elif initial:
+                    with products_container:
+                        ui.label(f'No products found in {category_name} category').classes('text-gray-500 text-xl')
+
+                # Offer the next page only when this one came back full;
+                # the id cursor only pages the default ordering
+                load_more_row.clear()
+                if len(products) == page_size and not filters['order_by']:
+                    with load_more_row:
+                        ui.button('Load More', on_click=lambda: load_products()).props('flat color=primary')
             except Exception as e:
                 app_logger.error(f"Error loading category products: {e}")
                 with products_container:
                     ui.label('Unable to load products').classes('text-gray-500')
-        
-        load_products()
 
-def apply_filters(category_name: str, price_filter: str, sort_filter: str):
-    """Apply filters to product listing"""
-    # This would implement actual filtering logic
-    ui.notify(f'Filters applied: {price_filter}, {sort_filter}', type='info')
+        async def apply_filters():
+            filters['price_min'], filters['price_max'] = _PRICE_FILTERS.get(price_filter.value, (None, None))
+            filters['order_by'] = _SORT_FILTERS.get(sort_filter.value)
+            await load_products(initial=True)
+
+        await load_products(initial=True)
 
 @ui.page('/product/{product_id}')
-def product_detail_page(product_id: int):
+async def product_detail_page(product_id: int):
     """Product detail page"""
     create_header()
-    
+
     with ui.column().classes('w-full max-w-7xl mx-auto px-4 py-8'):
         try:
-            with get_db_session() as db:
-                product_service = ProductService(db)
-                product = product_service.get_product(product_id)
-                
-                if not product:
-                    ui.label('Product not found').classes('text-2xl text-gray-500')
-                    return
+            product = await asyncio.to_thread(_fetch_product, product_id)
+
+            if not product:
+                ui.label('Product not found').classes('text-2xl text-gray-500')
+                return
+
+            with ui.row().classes('w-full gap-8'):
+                # Product image
+                with ui.column().classes('w-1/2'):
+                    ui.image(product.image_url or '/static/images/placeholder-product.png').classes('w-full h-96 object-cover rounded-lg')
                 
-                with ui.row().classes('w-full gap-8'):
-                    # Product image
-                    with ui.column().classes('w-1/2'):
-                        ui.image(product.image_url or '/static/images/placeholder-product.png').classes('w-full h-96 object-cover rounded-lg')
+                # Product details
+                with ui.column().classes('w-1/2'):
+                    ui.label(product.name).classes('text-3xl font-bold mb-4')
+                    ui.label(format_price(product.price)).classes('text-2xl font-bold text-blue-600 mb-4')
                     
-                    # Product details
-                    with ui.column().classes('w-1/2'):
-                        ui.label(product.name).classes('text-3xl font-bold mb-4')
-                        ui.label(format_price(product.price)).classes('text-2xl font-bold text-blue-600 mb-4')
-                        
-                        # Stock status
-                        if product.stock_quantity > 0:
-                            ui.label(f'In Stock ({product.stock_quantity} available)').classes('text-lg text-green-600 mb-4')
-                        else:
-                            ui.label('Out of Stock').classes('text-lg text-red-600 mb-4')
-                        
-                        # Description
-                        ui.label('Description').classes('text-xl font-semibold mb-2')
-                        ui.label(product.description or 'No description available').classes('text-gray-700 mb-6')
-                        
-                        # Specifications
-                        if product.specifications:
-                            ui.label('Specifications').classes('text-xl font-semibold mb-2')
-                            ui.label(product.specifications).classes('text-gray-700 mb-6')
-                        
-                        # Add to cart
-                        if product.stock_quantity > 0:
-                            with ui.row().classes('gap-4 items-center'):
-                                quantity_input = ui.number('Quantity', value=1, min=1, max=product.stock_quantity).classes('w-24')
-                                ui.button('Add to Cart', icon='add_shopping_cart',
-                                         on_click=lambda: add_to_cart(product.id, int(quantity_input.value))).props('size=lg color=primary')
-                        else:
-                            ui.button('Out of Stock').props('size=lg disable color=grey')
-                
+                    # Stock status
+                    if product.stock_quantity > 0:
+                        ui.label(f'In Stock ({product.stock_quantity} available)').classes('text-lg text-green-600 mb-4')
+                    else:
+                        ui.label('Out of Stock').classes('text-lg text-red-600 mb-4')
+                    
+                    # Description
+                    ui.label('Description').classes('text-xl font-semibold mb-2')
+                    ui.label(product.description or 'No description available').classes('text-gray-700 mb-6')
+                    
+                    # Specifications
+                    if product.specifications:
+                        ui.label('Specifications').classes('text-xl font-semibold mb-2')
+                        ui.label(product.specifications).classes('text-gray-700 mb-6')
+                    
+                    # Add to cart
+                    if product.stock_quantity > 0:
+                        with ui.row().classes('gap-4 items-center'):
+                            quantity_input = ui.number('Quantity', value=1, min=1, max=product.stock_quantity).classes('w-24')
+                            ui.button('Add to Cart', icon='add_shopping_cart',
+                                     on_click=lambda: add_to_cart(product.id, int(quantity_input.value))).props('size=lg color=primary')
+                    else:
+                        ui.button('Out of Stock').props('size=lg disable color=grey')
+            
         except Exception as e:
             app_logger.error(f"Error loading product details: {e}")
             ui.label('Unable to load product details').classes('text-2xl text-gray-500')
 
 @ui.page('/cart')
-def cart_page():
+async def cart_page():
     """Shopping cart page"""
+    # Auth guard first, before any element is allocated
+    if not current_user():
+        ui.navigate.to('/login')
+        return
+
     create_header()
-    
+
     with ui.column().classes('w-full max-w-4xl mx-auto px-4 py-8'):
         ui.label('Shopping Cart').classes('text-3xl font-bold mb-6')
-        
-        if not app_state.current_user:
-            ui.label('Please login to view your cart').classes('text-xl text-gray-500')
-            ui.button('Login', on_click=lambda: ui.navigate.to('/login')).props('color=primary')
-            return
-        
+
         cart_container = ui.column().classes('w-full')
         
-        def load_cart():
+        async def load_cart():
             cart_container.clear()
             try:
-                with get_db_session() as db:
-                    cart_service = CartService(db)
-                    cart_items = cart_service.get_cart_items(app_state.current_cart.id)
-                    
-                    if not cart_items:
-                        with cart_container:
-                            ui.label('Your cart is empty').classes('text-xl text-gray-500 text-center py-8')
-                            ui.button('Continue Shopping', on_click=lambda: ui.navigate.to('/')).props('color=primary')
-                        return
-                    
-                    total = 0
+                cart_items = await asyncio.to_thread(_fetch_cart_view, current_cart_id())
+
+                if not cart_items:
                     with cart_container:
-                        for item in cart_items:
-                            with ui.card().classes('w-full mb-4'):
-                                with ui.row().classes('w-full items-center p-4'):
-                                    # Product image
-                                    ui.image(item.product.image_url or '/static/images/placeholder-product.png').classes('w-20 h-20 object-cover')
-                                    
-                                    # Product details
-                                    with ui.column().classes('flex-1 ml-4'):
-                                        ui.label(item.product.name).classes('text-lg font-semibold')
-                                        ui.label(format_price(item.product.price)).classes('text-blue-600 font-bold')
-                                    
-                                    # Quantity controls
-                                    with ui.row().classes('items-center gap-2'):
-                                        ui.button('-', on_click=lambda item_id=item.id: update_cart_quantity(item_id, -1)).props('size=sm')
-                                        ui.label(str(item.quantity)).classes('mx-2 font-semibold')
-                                        ui.button('+', on_click=lambda item_id=item.id: update_cart_quantity(item_id, 1)).props('size=sm')
-                                    
-                                    # Remove button
-                                    ui.button('Remove', icon='delete', 
-                                             on_click=lambda item_id=item.id: remove_from_cart(item_id)).props('flat color=negative')
-                                    
-                                    # Item total
-                                    item_total = item.product.price * item.quantity
-                                    ui.label(format_price(item_total)).classes('text-lg font-bold ml-4')
-                                    total += item_total
-                        
-                        # Cart summary
-                        with ui.card().classes('w-full mt-6'):
-                            with ui.card_section().classes('p-6'):
-                                ui.label('Order Summary').classes('text-xl font-bold mb-4')
-                                with ui.row().classes('w-full justify-between'):
-                                    ui.label('Total:').classes('text-lg')
-                                    ui.label(format_price(total)).classes('text-2xl font-bold text-blue-600')
-                                
-                                ui.button('Proceed to Checkout', on_click=lambda: ui.navigate.to('/checkout')).props('size=lg color=primary class=w-full mt-4')
-            
+                        ui.label('Your cart is empty').classes('text-xl text-gray-500 text-center py-8')
+                        ui.button('Continue Shopping', on_click=lambda: ui.navigate.to('/')).props('color=primary')
+                    return
+
+                total = sum(item.price * item.quantity for item in cart_items)
+
+                # Running total shared by the row callbacks below; the
+                # summary label is rebound in place after each mutation
+                # instead of reloading the whole page
+                summary = {'total': total}
+                total_label = None
+
+                def on_quantity_change(item_id: int, price: float, change: int, refs: dict):
+                    try:
+                        with get_db_session() as db:
+                            success, new_count = CartService(db).update_cart_item_quantity(item_id, change)
+                        if not success:
+                            ui.notify('Failed to update quantity', type='negative')
+                            return
+                        set_cart_items_count(new_count)
+                        new_quantity = int(refs['quantity'].text) + change
+                        summary['total'] += price * change
+                        if new_quantity <= 0:
+                            refs['card'].delete()
+                        else:
+                            refs['quantity'].text = str(new_quantity)
+                            refs['line_total'].text = format_price(price * new_quantity)
+                        total_label.text = format_price(summary['total'])
+                    except Exception as e:
+                        app_logger.error(f"Error updating cart quantity: {e}")
+                        ui.notify('Failed to update quantity', type='negative')
+
+                def on_remove(item_id: int, price: float, refs: dict):
+                    try:
+                        with get_db_session() as db:
+                            success, new_count = CartService(db).remove_from_cart(item_id)
+                        if not success:
+                            ui.notify('Failed to remove item', type='negative')
+                            return
+                        set_cart_items_count(new_count)
+                        summary['total'] -= price * int(refs['quantity'].text)
+                        refs['card'].delete()
+                        total_label.text = format_price(summary['total'])
+                    except Exception as e:
+                        app_logger.error(f"Error removing from cart: {e}")
+                        ui.notify('Failed to remove item', type='negative')
+
+                with cart_container:
+                    for item in cart_items:
+                        # Element references for the in-place updates,
+                        # filled in as the row is built
+                        refs = {}
+                        with ui.card().classes('w-full mb-4') as item_card:
+                            refs['card'] = item_card
+                            with ui.row().classes('w-full items-center p-4'):
+                                # Product image
+                                ui.image(item.image_url or '/static/images/placeholder-product.png').classes('w-20 h-20 object-cover')
+
+                                # Product details
+                                with ui.column().classes('flex-1 ml-4'):
+                                    ui.label(item.name).classes('text-lg font-semibold')
+                                    ui.label(format_price(item.price)).classes('text-blue-600 font-bold')
+
+                                # Quantity controls
+                                with ui.row().classes('items-center gap-2'):
+                                    ui.button('-', on_click=lambda item_id=item.id, price=item.price, refs=refs: on_quantity_change(item_id, price, -1, refs)).props('size=sm')
+                                    refs['quantity'] = ui.label(str(item.quantity)).classes('mx-2 font-semibold')
+                                    ui.button('+', on_click=lambda item_id=item.id, price=item.price, refs=refs: on_quantity_change(item_id, price, 1, refs)).props('size=sm')
+
+                                # Remove button
+                                ui.button('Remove', icon='delete',
+                                         on_click=lambda item_id=item.id, price=item.price, refs=refs: on_remove(item_id, price, refs)).props('flat color=negative')
+
+                                # Item total
+                                refs['line_total'] = ui.label(format_price(item.price * item.quantity)).classes('text-lg font-bold ml-4')
+
+                    # Cart summary
+                    with ui.card().classes('w-full mt-6'):
+                        with ui.card_section().classes('p-6'):
+                            ui.label('Order Summary').classes('text-xl font-bold mb-4')
+                            with ui.row().classes('w-full justify-between'):
+                                ui.label('Total:').classes('text-lg')
+                                total_label = ui.label(format_price(total)).classes('text-2xl font-bold text-blue-600')
+
+                            ui.button('Proceed to Checkout', on_click=lambda: ui.navigate.to('/checkout')).props('size=lg color=primary class=w-full mt-4')
+
             except Exception as e:
                 app_logger.error(f"Error loading cart: {e}")
                 with cart_container:
                     ui.label('Unable to load cart').classes('text-gray-500')
-        
-        load_cart()
 
-def update_cart_quantity(item_id: int, change: int):
-    """Update cart item quantity"""
-    try:
-        with get_db_session() as db:
-            cart_service = CartService(db)
-            cart_service.update_cart_item_quantity(item_id, change)
-            app_state.cart_items_count = cart_service.get_cart_items_count(app_state.current_cart.id)
-            ui.navigate.reload()
-    except Exception as e:
-        app_logger.error(f"Error updating cart quantity: {e}")
-        ui.notify('Failed to update quantity', type='negative')
-
-def remove_from_cart(item_id: int):
-    """Remove item from cart"""
-    try:
-        with get_db_session() as db:
-            cart_service = CartService(db)
-            cart_service.remove_from_cart(item_id)
-            app_state.cart_items_count = cart_service.get_cart_items_count(app_state.current_cart.id)
-            ui.navigate.reload()
-    except Exception as e:
-        app_logger.error(f"Error removing from cart: {e}")
-        ui.notify('Failed to remove item', type='negative')
+        await load_cart()
 
 @ui.page('/login')
 def login_page():
@@ -389,18 +548,17 @@ def login_page():
                 email_input = ui.input('Email', placeholder='Enter your email').classes('w-full mb-4')
                 password_input = ui.input('Password', placeholder='Enter your password', password=True).classes('w-full mb-6')
                 
-                def handle_login():
+                async def handle_login():
                     try:
-                        with get_db_session() as db:
-                            auth_service = AuthService(db)
-                            user = auth_service.authenticate_user(email_input.value, password_input.value)
-                            
-                            if user:
-                                app_state.set_user(user)
-                                ui.notify('Login successful!', type='positive')
-                                ui.navigate.to('/')
-                            else:
-                                ui.notify('Invalid email or password', type='negative')
+                        user = await asyncio.to_thread(
+                            _authenticate, email_input.value, password_input.value)
+
+                        if user:
+                            set_user(user)
+                            ui.notify('Login successful!', type='positive')
+                            ui.navigate.to('/')
+                        else:
+                            ui.notify('Invalid email or password', type='negative')
                     except Exception as e:
                         app_logger.error(f"Login error: {e}")
                         ui.notify('Login failed', type='negative')
@@ -427,27 +585,25 @@ def register_page():
                 password_input = ui.input('Password', placeholder='Choose a password', password=True).classes('w-full mb-4')
                 confirm_password_input = ui.input('Confirm Password', placeholder='Confirm your password', password=True).classes('w-full mb-6')
                 
-                def handle_register():
+                async def handle_register():
                     if password_input.value != confirm_password_input.value:
                         ui.notify('Passwords do not match', type='negative')
                         return
-                    
+
                     try:
-                        with get_db_session() as db:
-                            auth_service = AuthService(db)
-                            user = auth_service.create_user(
-                                username=username_input.value,
-                                email=email_input.value,
-                                password=password_input.value,
-                                full_name=full_name_input.value
-                            )
-                            
-                            if user:
-                                app_state.set_user(user)
-                                ui.notify('Account created successfully!', type='positive')
-                                ui.navigate.to('/')
-                            else:
-                                ui.notify('Failed to create account', type='negative')
+                        user = await asyncio.to_thread(
+                            _register,
+                            username_input.value,
+                            email_input.value,
+                            password_input.value,
+                            full_name_input.value)
+
+                        if user:
+                            set_user(user)
+                            ui.notify('Account created successfully!', type='positive')
+                            ui.navigate.to('/')
+                        else:
+                            ui.notify('Failed to create account', type='negative')
                     except Exception as e:
                         app_logger.error(f"Registration error: {e}")
                         ui.notify('Registration failed', type='negative')
@@ -459,43 +615,50 @@ def register_page():
                     ui.link('Login', '/login').classes('text-blue-600 ml-2')
 
 @ui.page('/checkout')
-def checkout_page():
+async def checkout_page():
     """Checkout page"""
-    create_header()
-    
-    if not app_state.current_user:
+    # Auth guard first: an unauthenticated hit costs a redirect, not a
+    # full header build
+    if not current_user():
         ui.navigate.to('/login')
         return
-    
+
+    create_header()
+
     with ui.column().classes('w-full max-w-4xl mx-auto px-4 py-8'):
         ui.label('Checkout').classes('text-3xl font-bold mb-6')
-        
+
+        # The order summary and the profile used to prefill the shipping
+        # form are independent reads; gather overlaps their round-trips
+        try:
+            cart_items, profile = await asyncio.gather(
+                asyncio.to_thread(_fetch_cart_view, current_cart_id()),
+                asyncio.to_thread(_fetch_user, current_user()['id']),
+            )
+            summary_failed = False
+        except Exception as e:
+            app_logger.error(f"Error loading checkout data: {e}")
+            cart_items, profile = [], None
+            summary_failed = True
+
         with ui.row().classes('w-full gap-8'):
             # Order summary
             with ui.column().classes('w-1/2'):
                 ui.label('Order Summary').classes('text-xl font-bold mb-4')
-                
-                try:
-                    with get_db_session() as db:
-                        cart_service = CartService(db)
-                        cart_items = cart_service.get_cart_items(app_state.current_cart.id)
-                        
-                        total = 0
-                        for item in cart_items:
-                            with ui.row().classes('w-full justify-between mb-2'):
-                                ui.label(f"{item.product.name} x {item.quantity}")
-                                item_total = item.product.price * item.quantity
-                                ui.label(format_price(item_total))
-                                total += item_total
-                        
-                        ui.separator()
-                        with ui.row().classes('w-full justify-between mt-4'):
-                            ui.label('Total:').classes('text-lg font-bold')
-                            ui.label(format_price(total)).classes('text-xl font-bold text-blue-600')
-                
-                except Exception as e:
-                    app_logger.error(f"Error loading checkout summary: {e}")
+
+                if summary_failed:
                     ui.label('Unable to load order summary').classes('text-gray-500')
+                else:
+                    total = sum(item.price * item.quantity for item in cart_items)
+                    for item in cart_items:
+                        with ui.row().classes('w-full justify-between mb-2'):
+                            ui.label(f"{item.name} x {item.quantity}")
+                            ui.label(format_price(item.price * item.quantity))
+
+                    ui.separator()
+                    with ui.row().classes('w-full justify-between mt-4'):
+                        ui.label('Total:').classes('text-lg font-bold')
+                        ui.label(format_price(total)).classes('text-xl font-bold text-blue-600')
             
             # Shipping and payment
             with ui.column().classes('w-1/2'):
@@ -503,6 +666,13 @@ def checkout_page():
                 
                 address_input = ui.textarea('Shipping Address', placeholder='Enter your shipping address').classes('w-full mb-4')
                 phone_input = ui.input('Phone Number', placeholder='Enter your phone number').classes('w-full mb-6')
+
+                # Prefill from the saved profile fetched alongside the cart
+                if profile:
+                    if profile.address:
+                        address_input.value = profile.address
+                    if profile.phone:
+                        phone_input.value = profile.phone
                 
                 ui.label('Payment Method').classes('text-xl font-bold mb-4')
                 payment_method = ui.select(['Credit Card', 'PayPal', 'Bank Transfer'], value='Credit Card').classes('w-full mb-4')
@@ -514,32 +684,33 @@ def checkout_page():
                     cvv_input = ui.input('CVV', placeholder='123').classes('w-1/2')
                 
                 def handle_place_order():
+                    # Disable immediately so a double click cannot
+                    # submit the same cart twice
+                    place_order_button.disable()
                     try:
                         with get_db_session() as db:
-                            order_service = OrderService(db)
-                            cart_service = CartService(db)
-                            
-                            # Create order from cart
-                            order = order_service.create_order_from_cart(
-                                user_id=app_state.current_user.id,
-                                cart_id=app_state.current_cart.id,
-                                shipping_address=address_input.value
+                            # One transaction: order creation, stock
+                            # decrement and cart cleanup commit together
+                            order = OrderService(db).checkout(
+                                user_id=current_user()['id'],
+                                cart_id=current_cart_id(),
+                                shipping_address=address_input.value,
+                                phone=phone_input.value
                             )
-                            
-                            if order:
-                                # Clear cart
-                                cart_service.clear_cart(app_state.current_cart.id)
-                                app_state.cart_items_count = 0
-                                
-                                ui.notify('Order placed successfully!', type='positive')
-                                ui.navigate.to(f'/order-confirmation/{order.id}')
-                            else:
-                                ui.notify('Failed to place order', type='negative')
+
+                        if order:
+                            set_cart_items_count(0)
+                            ui.notify('Order placed successfully!', type='positive')
+                            ui.navigate.to(f'/order-confirmation/{order.id}')
+                        else:
+                            ui.notify('Failed to place order', type='negative')
+                            place_order_button.enable()
                     except Exception as e:
                         app_logger.error(f"Error placing order: {e}")
                         ui.notify('Failed to place order', type='negative')
-                
-                ui.button('Place Order', on_click=handle_place_order).props('size=lg color=primary class=w-full')
+                        place_order_button.enable()
+
+                place_order_button = ui.button('Place Order', on_click=handle_place_order).props('size=lg color=primary class=w-full')
 
 @ui.page('/order-confirmation/{order_id}')
 def order_confirmation_page(order_id: int):
@@ -558,36 +729,55 @@ def order_confirmation_page(order_id: int):
             ui.button('View Orders', on_click=lambda: ui.navigate.to('/orders')).props('flat color=primary')
 
 @ui.page('/search')
-def search_page():
+async def search_page():
     """Search results page"""
     create_header()
     
-    # Get search query from URL parameters
-    query = ui.context.client.query.get('q', '')
+    # Parse the URL parameters exactly once per navigation; anything on
+    # this page that needs them (including future filter callbacks)
+    # closes over this dict instead of re-reading the client query
+    params = dict(ui.context.client.query)
+    query = params.get('q', '')
     
     with ui.column().classes('w-full max-w-7xl mx-auto px-4 py-8'):
         ui.label(f'Search Results for "{query}"').classes('text-3xl font-bold mb-6')
         
+        # Results grid, rendered one keyset page at a time like the
+        # category grid
         products_container = ui.row().classes('w-full gap-6 flex-wrap')
-        
-        try:
-            with get_db_session() as db:
-                product_service = ProductService(db)
-                products = product_service.search_products(query)
-                
+        load_more_row = ui.row().classes('w-full justify-center mt-4')
+
+        page_size = 24
+        cursor = {'after_id': 0}
+
+        async def load_results(initial: bool = False):
+            try:
+                products = await asyncio.to_thread(
+                    _fetch_search_results, query, page_size, cursor['after_id'])
+
                 if products:
+                    cursor['after_id'] = products[-1].id
                     with products_container:
                         for product in products:
                             create_product_card(product)
-                else:
+                elif initial:
                     with products_container:
                         ui.label(f'No products found for "{query}"').classes('text-gray-500 text-xl')
-        except Exception as e:
-            app_logger.error(f"Error searching products: {e}")
-            with products_container:
-                ui.label('Unable to search products').classes('text-gray-500')
 
-# Initialize sample data on startup
+                load_more_row.clear()
+                if len(products) == page_size:
+                    with load_more_row:
+                        ui.button('Load More', on_click=lambda: load_results()).props('flat color=primary')
+            except Exception as e:
+                app_logger.error(f"Error searching products: {e}")
+                with products_container:
+                    ui.label('Unable to search products').classes('text-gray-500')
+
+        await load_results(initial=True)
+
+# Initialize sample data on startup. create_sample_data is gated on an
+# EXISTS probe and bulk-inserts through Core, so a dev-reload re-import
+# costs one short query, not a re-seed.
 def init_sample_data():
     """Initialize sample HP products"""
     try:
@@ -1,7 +1,7 @@
 """Shopping cart models"""
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, DateTime, ForeignKey, func
+from sqlalchemy import Integer, DateTime, ForeignKey, UniqueConstraint, func
 from datetime import datetime
 from typing import List
 
@@ -10,12 +10,17 @@ from app.core.database import Base
 class Cart(Base):
     __tablename__ = "carts"
     
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
-    
+
+    # Denormalized sum of item quantities, kept in sync by CartService
+    # mutations so the header badge reads a single row by primary key
+    # instead of running a SUM aggregate
+    items_count: Mapped[int] = mapped_column(Integer, default=0)
+
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
-    
+
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="carts")
     items: Mapped[List["CartItem"]] = relationship("CartItem", back_populates="cart", cascade="all, delete-orphan")
@@ -25,15 +30,23 @@ class Cart(Base):
 
 class CartItem(Base):
     __tablename__ = "cart_items"
-    
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+
+    # One row per (cart, product); add_to_cart upserts against this
+    # constraint so concurrent adds can never create duplicate lines
+    __table_args__ = (
+        UniqueConstraint("cart_id", "product_id", name="uq_cart_product"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
     cart_id: Mapped[int] = mapped_column(Integer, ForeignKey("carts.id"))
     product_id: Mapped[int] = mapped_column(Integer, ForeignKey("products.id"))
     quantity: Mapped[int] = mapped_column(Integer, default=1)
-    
+
+    # No updated_at here: cart items are the highest-churn rows in the
+    # app and nothing reads a per-line timestamp — Cart.updated_at
+    # already tracks when the cart last changed
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
-    
+
     # Relationships
     cart: Mapped[Cart] = relationship("Cart", back_populates="items")
     product: Mapped["Product"] = relationship("Product", back_populates="cart_items")
@@ -1,7 +1,7 @@
 """Order models for purchase tracking"""
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Float, Integer, DateTime, ForeignKey, Text, Enum, func
+from sqlalchemy import String, Float, Integer, DateTime, ForeignKey, Text, Enum, Index, func
 from datetime import datetime
 from typing import List, Optional
 import enum
@@ -18,12 +18,24 @@ class OrderStatus(enum.Enum):
 
 class Order(Base):
     __tablename__ = "orders"
-    
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+
+    # Server-generated defaults (created_at etc.) come back with the
+    # INSERT where the dialect supports RETURNING, so freshly created
+    # orders don't need a refresh round-trip
+    __mapper_args__ = {"eager_defaults": True}
+
+    id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
     
     total_amount: Mapped[float] = mapped_column(Float)
-    status: Mapped[OrderStatus] = mapped_column(Enum(OrderStatus), default=OrderStatus.PENDING)
+    # values_callable stores the short lowercase .value strings instead
+    # of the member names, and native_enum uses the database's enum type
+    # where one exists. Status filtering is served by the composite
+    # (status, created_at DESC) index declared below the class.
+    status: Mapped[OrderStatus] = mapped_column(
+        Enum(OrderStatus, native_enum=True, values_callable=lambda e: [m.value for m in e]),
+        default=OrderStatus.PENDING
+    )
     
     shipping_address: Mapped[str] = mapped_column(Text)
     phone: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
@@ -45,10 +57,16 @@ class Order(Base):
     def __repr__(self) -> str:
         return f"<Order(id={self.id}, user_id={self.user_id}, total={self.total_amount}, status={self.status.value})>"
 
+# Composite indexes matching the two order list queries — a user's
+# order history and the admin status filter, both newest first — so
+# each becomes an index range scan already in output order
+Index("ix_orders_user_created", Order.user_id, Order.created_at.desc())
+Index("ix_orders_status_created", Order.status, Order.created_at.desc())
+
 class OrderItem(Base):
     __tablename__ = "order_items"
     
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     order_id: Mapped[int] = mapped_column(Integer, ForeignKey("orders.id"))
     product_id: Mapped[int] = mapped_column(Integer, ForeignKey("products.id"))
     
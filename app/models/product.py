@@ -1,7 +1,7 @@
 """Product model for ecommerce catalog"""
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Float, Integer, Text, DateTime, ForeignKey, func
+from sqlalchemy import String, Float, Integer, Text, DateTime, ForeignKey, Index, func, text
 from datetime import datetime
 from typing import List, Optional
 
@@ -10,7 +10,7 @@ from app.core.database import Base
 class Category(Base):
     __tablename__ = "categories"
     
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(100), unique=True, index=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     image_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
@@ -25,21 +25,66 @@ class Category(Base):
 
 class Product(Base):
     __tablename__ = "products"
-    
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+
+    # ix_products_catalog serves the catalog page's exact shape —
+    # active products in a category ordered by price. It is partial on
+    # is_active (only rows the page can show), and on Postgres the
+    # INCLUDE columns make it an index-only scan so the listing never
+    # touches the heap. The featured partial index covers the homepage
+    # strip the same way.
+    __table_args__ = (
+        # The SQLite predicates are spelled "is_active = 1" because the
+        # queries compile their filters that way and SQLite only uses a
+        # partial index when the query's WHERE provably implies the
+        # index's — it cannot prove "is_active = 1" from bare
+        # "is_active" (confirmed with EXPLAIN QUERY PLAN)
+        Index(
+            "ix_products_catalog", "category_id", "price",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active"),
+            postgresql_include=["name", "image_url", "stock_quantity"],
+        ),
+        Index(
+            "ix_products_featured_active", "is_featured",
+            sqlite_where=text("is_active = 1 AND is_featured = 1"),
+            postgresql_where=text("is_active AND is_featured"),
+        ),
+        Index(
+            "ix_products_active_price", "price",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active"),
+        ),
+    )
+
+    # Fetch server-generated defaults back with the INSERT/UPDATE via
+    # RETURNING instead of a refresh round-trip after commit
+    __mapper_args__ = {"eager_defaults": True}
+
+
+    id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255), index=True)
-    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    price: Mapped[float] = mapped_column(Float, index=True)
+    # The long text columns are only shown on the detail page, so they
+    # are deferred out of listing queries; get_product undefers the
+    # "details" group for the one page that renders them
+    description: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True, deferred=True, deferred_group="details")
+    # Price queries always filter is_active, so the partial
+    # ix_products_active_price above serves them; no full index needed
+    price: Mapped[float] = mapped_column(Float)
     sku: Mapped[str] = mapped_column(String(100), unique=True, index=True)
     stock_quantity: Mapped[int] = mapped_column(Integer, default=0)
     image_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
-    specifications: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    specifications: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True, deferred=True, deferred_group="details")
     
     # Category relationship
     category_id: Mapped[int] = mapped_column(Integer, ForeignKey("categories.id"))
     category: Mapped[Category] = relationship("Category", back_populates="products")
     
-    # Flags
+    # Flags stay as separate boolean columns rather than a packed
+    # bitmask: the partial indexes above already serve the hot
+    # is_active/is_featured predicates, and plain columns keep the
+    # queries and seed data readable
     is_featured: Mapped[bool] = mapped_column(default=False)
     is_active: Mapped[bool] = mapped_column(default=True)
     
@@ -1,18 +1,80 @@
 """Authentication service for user management"""
 
+import asyncio
+import hashlib
+import threading
+import time
+
 from sqlalchemy.orm import Session
-from sqlalchemy import select
-from typing import Optional
+from sqlalchemy import bindparam, select, update, func
+from sqlalchemy.exc import IntegrityError
+from typing import Dict, Optional, Tuple
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
+import jwt
 
 from app.models.user import User
 from app.core.config import settings
 from app.core.logging import app_logger
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Fixed-shape hot statements are built once at import (same pattern as
+# ProductService); only bind values change per call, so the Select
+# construction cost isn't re-paid on every lookup
+_SEL_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_SEL_USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+
+# Password hashing. argon2id is the preferred scheme: its native
+# implementation verifies noticeably faster than bcrypt at equivalent
+# security, and the memory/time parameters follow current OWASP
+# guidance. bcrypt stays registered (deprecated) so existing hashes
+# keep verifying; verify_and_update re-hashes them to argon2 on the
+# next successful login.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__memory_cost=19456,
+    argon2__time_cost=2,
+    argon2__parallelism=1,
+)
+
+# Async wrappers for the CPU-bound hash operations: callers on the
+# event loop should await these so hashing runs in a worker thread
+# instead of blocking every other client for its duration.
+async def hash_password_async(password: str) -> str:
+    """Hash a password in a worker thread"""
+    return await asyncio.to_thread(pwd_context.hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash in a worker thread"""
+    return await asyncio.to_thread(pwd_context.verify, plain_password, hashed_password)
+
+# The same bearer token is decoded on every authenticated request —
+# identical HMAC and JSON-parse work thousands of times per session.
+# Verified payloads are kept in a small in-process TTL cache, keyed by
+# a blake2b digest so full token strings are not retained in memory.
+# Expiry is still re-checked on every hit, so a cached token can never
+# outlive its own exp claim. verify_token runs from worker threads, so
+# cache access is guarded by a lock.
+_TOKEN_CACHE_TTL = 60.0
+_TOKEN_CACHE_MAX = 4096
+_token_cache: Dict[bytes, Tuple[float, dict]] = {}
+_token_cache_lock = threading.Lock()
+
+# get_current_user resolves the JWT subject to a User row on every
+# authenticated request — the single most repeated SELECT in the app.
+# Cache email -> detached User (readable thanks to
+# expire_on_commit=False) for a short TTL; user writes invalidate.
+_USER_CACHE_TTL = 60.0
+_user_cache: Dict[str, Tuple[float, "User"]] = {}
+_user_cache_lock = threading.Lock()
+
+def _invalidate_user_cache(email: Optional[str] = None) -> None:
+    """Drop one cached user, or all of them, after a user write"""
+    with _user_cache_lock:
+        if email is None:
+            _user_cache.clear()
+        else:
+            _user_cache.pop(email, None)
 
 class AuthService:
     """Service for authentication and user management"""
@@ -31,9 +93,7 @@ class AuthService:
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
         try:
-            stmt = select(User).where(User.email == email)
-            result = self.db.execute(stmt)
-            return result.scalar_one_or_none()
+            return self.db.scalar(_SEL_USER_BY_EMAIL, {"email": email})
         except Exception as e:
             app_logger.error(f"Error getting user by email {email}: {e}")
             return None
@@ -41,9 +101,7 @@ class AuthService:
     def get_user_by_username(self, username: str) -> Optional[User]:
         """Get user by username"""
         try:
-            stmt = select(User).where(User.username == username)
-            result = self.db.execute(stmt)
-            return result.scalar_one_or_none()
+            return self.db.scalar(_SEL_USER_BY_USERNAME, {"username": username})
         except Exception as e:
             app_logger.error(f"Error getting user by username {username}: {e}")
             return None
@@ -55,9 +113,16 @@ class AuthService:
             if not user:
                 return None
             
-            if not self.verify_password(password, user.hashed_password):
+            valid, new_hash = pwd_context.verify_and_update(password, user.hashed_password)
+            if not valid:
                 return None
-            
+
+            if new_hash:
+                # Legacy (bcrypt) hash verified — upgrade it to argon2
+                user.hashed_password = new_hash
+                self.db.commit()
+                app_logger.info(f"Upgraded password hash for user: {email}")
+
             if not user.is_active:
                 app_logger.warning(f"Inactive user attempted login: {email}")
                 return None
@@ -68,19 +133,20 @@ class AuthService:
             app_logger.error(f"Error authenticating user {email}: {e}")
             return None
     
-    def create_user(self, username: str, email: str, password: str, full_name: str = None) -> Optional[User]:
-        """Create a new user"""
+    def create_user(self, username: str, email: str, password: str, full_name: str = None,
+                    auto_commit: bool = True) -> Optional[User]:
+        """Create a new user.
+
+        Pass auto_commit=False when the caller manages the transaction
+        (e.g. batch seeding) so the user is flushed but committed once
+        by the enclosing session.
+
+        Uniqueness of username and email is enforced by the database's
+        unique indexes rather than pre-insert SELECTs: the INSERT either
+        succeeds or raises IntegrityError, which saves two round-trips
+        per signup and closes the check-then-insert race.
+        """
         try:
-            # Check if user already exists
-            if self.get_user_by_email(email):
-                app_logger.warning(f"Attempted to create user with existing email: {email}")
-                return None
-            
-            if self.get_user_by_username(username):
-                app_logger.warning(f"Attempted to create user with existing username: {username}")
-                return None
-            
-            # Create new user
             hashed_password = self.get_password_hash(password)
             user = User(
                 username=username,
@@ -91,11 +157,22 @@ class AuthService:
             )
             
             self.db.add(user)
-            self.db.commit()
-            self.db.refresh(user)
-            
+            if auto_commit:
+                self.db.commit()
+                self.db.refresh(user)
+            else:
+                self.db.flush()
+
             app_logger.info(f"Created new user: {email}")
             return user
+        except IntegrityError as e:
+            self.db.rollback()
+            message = str(e.orig).lower()
+            if "username" in message:
+                app_logger.warning(f"Attempted to create user with existing username: {username}")
+            else:
+                app_logger.warning(f"Attempted to create user with existing email: {email}")
+            return None
         except Exception as e:
             app_logger.error(f"Error creating user {email}: {e}")
             self.db.rollback()
@@ -114,11 +191,36 @@ class AuthService:
         return encoded_jwt
     
     def verify_token(self, token: str) -> Optional[dict]:
-        """Verify JWT token and return payload"""
+        """Verify JWT token and return payload.
+
+        Repeat verifications of the same token are served from the
+        in-process payload cache; the exp claim is re-checked on every
+        hit so cached entries still expire on time.
+        """
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        with _token_cache_lock:
+            cached = _token_cache.get(key)
+        if cached and time.monotonic() - cached[0] < _TOKEN_CACHE_TTL:
+            payload = cached[1]
+            exp = payload.get("exp")
+            # exp is a true UTC epoch (PyJWT encodes it that way), so
+            # compare against time.time() — utcnow().timestamp() would
+            # reinterpret the naive UTC wall-clock as local time and be
+            # off by the host's UTC offset
+            if exp is None or exp > time.time():
+                return payload
+            with _token_cache_lock:
+                _token_cache.pop(key, None)
+            return None
+
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            with _token_cache_lock:
+                if len(_token_cache) >= _TOKEN_CACHE_MAX:
+                    _token_cache.clear()
+                _token_cache[key] = (time.monotonic(), payload)
             return payload
-        except JWTError as e:
+        except jwt.PyJWTError as e:
             app_logger.warning(f"Invalid token: {e}")
             return None
     
@@ -132,8 +234,16 @@ class AuthService:
             email: str = payload.get("sub")
             if not email:
                 return None
-            
+
+            with _user_cache_lock:
+                cached = _user_cache.get(email)
+            if cached and time.monotonic() - cached[0] < _USER_CACHE_TTL:
+                return cached[1]
+
             user = self.get_user_by_email(email)
+            if user:
+                with _user_cache_lock:
+                    _user_cache[email] = (time.monotonic(), user)
             return user
         except Exception as e:
             app_logger.error(f"Error getting current user from token: {e}")
@@ -146,12 +256,15 @@ class AuthService:
             if not user:
                 return None
             
+            old_email = user.email
             for key, value in user_data.items():
                 if hasattr(user, key) and key != 'id':
                     setattr(user, key, value)
-            
+
             self.db.commit()
             self.db.refresh(user)
+            _invalidate_user_cache(old_email)
+            _invalidate_user_cache(user.email)
             app_logger.info(f"Updated user: {user.email}")
             return user
         except Exception as e:
@@ -170,8 +283,16 @@ class AuthService:
                 app_logger.warning(f"Invalid old password for user {user_id}")
                 return False
             
-            user.hashed_password = self.get_password_hash(new_password)
+            # Direct UPDATE touching only the password column: no ORM
+            # flush over the rest of the instance and nothing to refresh
+            self.db.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(hashed_password=self.get_password_hash(new_password), updated_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
             self.db.commit()
+            _invalidate_user_cache(user.email)
             app_logger.info(f"Password changed for user: {user.email}")
             return True
         except Exception as e:
@@ -1,12 +1,78 @@
 """Cart service for managing shopping cart operations"""
 
-from sqlalchemy.orm import Session
-from sqlalchemy import select, and_
-from typing import List, Optional
+from sqlalchemy.orm import Session, contains_eager, raiseload, selectinload
+from sqlalchemy import Row, bindparam, select, delete, and_, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import List, Optional, Tuple
 from app.models.cart import Cart, CartItem
 from app.models.product import Product
+from app.core import product_cache
 from app.core.logging import app_logger
 
+# Fixed-shape hot statements are built once at import (same pattern as
+# ProductService); only bind values change per call
+_SEL_CART_BY_USER = select(Cart).where(Cart.user_id == bindparam("user_id"))
+
+_SEL_ITEMS_COUNT = select(func.coalesce(func.sum(CartItem.quantity), 0)).where(
+    CartItem.cart_id == bindparam("cart_id")
+)
+
+# selectinload fetches all products in one extra query, so iterating
+# item.product never lazy-loads row by row (N+1). raiseload('*') turns
+# any other lazy load on these rows into an error, so an accidental
+# N+1 fails fast instead of silently issuing per-row SELECTs.
+_SEL_CART_ITEMS = (
+    select(CartItem)
+    .options(selectinload(CartItem.product), raiseload("*"))
+    .where(CartItem.cart_id == bindparam("cart_id"))
+    .join(Product)
+    .where(Product.is_active == True)
+)
+
+# Checkout variant: contains_eager hydrates each item's product from
+# the filter join itself, so items and products arrive in one SELECT
+# instead of selectinload's follow-up IN query — one round-trip while
+# the order transaction holds its locks
+_SEL_CART_ITEMS_JOINED = (
+    select(CartItem)
+    .join(Product)
+    .where(
+        and_(
+            CartItem.cart_id == bindparam("cart_id"),
+            Product.is_active == True
+        )
+    )
+    .options(contains_eager(CartItem.product), raiseload("*"))
+)
+
+# Projection for rendering: only the columns the cart and checkout
+# views actually show, returned as plain Row tuples with no ORM
+# instances, identity-map entries or relationship managers per row
+_SEL_CART_VIEW = (
+    select(CartItem.id, CartItem.quantity, Product.name, Product.price, Product.image_url)
+    .join(Product, CartItem.product_id == Product.id)
+    .where(
+        and_(
+            CartItem.cart_id == bindparam("cart_id"),
+            Product.is_active == True
+        )
+    )
+)
+
+_SEL_CART_SUMMARY = (
+    select(
+        func.coalesce(func.sum(CartItem.quantity), 0),
+        func.coalesce(func.sum(CartItem.quantity * Product.price), 0.0),
+    )
+    .join(Product, CartItem.product_id == Product.id)
+    .where(
+        and_(
+            CartItem.cart_id == bindparam("cart_id"),
+            Product.is_active == True
+        )
+    )
+)
+
 class CartService:
     """Service for cart-related operations"""
     
@@ -17,9 +83,7 @@ class CartService:
         """Get existing cart or create new one for user"""
         try:
             # Try to get existing cart
-            stmt = select(Cart).where(Cart.user_id == user_id)
-            result = self.db.execute(stmt)
-            cart = result.scalar_one_or_none()
+            cart = self.db.scalar(_SEL_CART_BY_USER, {"user_id": user_id})
             
             if not cart:
                 # Create new cart
@@ -34,88 +98,133 @@ class CartService:
             app_logger.error(f"Error getting/creating cart for user {user_id}: {e}")
             raise
     
-    def add_to_cart(self, cart_id: int, product_id: int, quantity: int = 1) -> bool:
-        """Add product to cart or update quantity if already exists"""
+    def _count_items(self, cart_id: int) -> int:
+        """Sum item quantities for a cart within the current session"""
+        return self.db.scalar(_SEL_ITEMS_COUNT, {"cart_id": cart_id})
+
+    def _sync_items_count(self, cart_id: int) -> int:
+        """Recompute and persist the cart's denormalized item count.
+
+        Called inside each mutation's transaction, so the counter column
+        can never drift from the actual rows.
+        """
+        new_count = self._count_items(cart_id)
+        cart = self.db.get(Cart, cart_id)
+        if cart:
+            cart.items_count = new_count
+        return new_count
+
+    def add_to_cart(self, cart_id: int, product_id: int, quantity: int = 1) -> Tuple[bool, int]:
+        """Add product to cart or update quantity if already exists.
+
+        Returns (success, new item count) so callers get the updated
+        count from the same session instead of issuing a second query.
+        """
         try:
-            # Check if product exists and has stock
-            product = self.db.get(Product, product_id)
+            # Check if product exists and has stock. The lookup is
+            # served cache-aside, so repeat adds of the same product
+            # skip the SELECT; checkout re-validates stock against the
+            # database under a lock, so a slightly stale read here is
+            # only a soft guard.
+            product = product_cache.get_product(self.db, product_id)
             if not product or not product.is_active:
                 app_logger.warning(f"Attempted to add inactive/non-existent product {product_id} to cart")
-                return False
-            
+                return False, self._count_items(cart_id)
+
             if product.stock_quantity < quantity:
                 app_logger.warning(f"Insufficient stock for product {product_id}: requested {quantity}, available {product.stock_quantity}")
-                return False
+                return False, self._count_items(cart_id)
             
-            # Check if item already in cart
-            stmt = select(CartItem).where(
-                and_(
-                    CartItem.cart_id == cart_id,
-                    CartItem.product_id == product_id
-                )
+            # Atomic upsert against uq_cart_product: a fresh row is
+            # inserted, an existing row gets the quantity added in
+            # place, all in one round-trip with no SELECT-then-write
+            # race. The WHERE guard on the update arm refuses a bump
+            # past available stock, which surfaces as rowcount 0.
+            stmt = sqlite_insert(CartItem).values(
+                cart_id=cart_id,
+                product_id=product_id,
+                quantity=quantity
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["cart_id", "product_id"],
+                set_={"quantity": CartItem.__table__.c.quantity + stmt.excluded.quantity},
+                where=CartItem.__table__.c.quantity + stmt.excluded.quantity <= product.stock_quantity,
             )
             result = self.db.execute(stmt)
-            cart_item = result.scalar_one_or_none()
-            
-            if cart_item:
-                # Update existing item
-                new_quantity = cart_item.quantity + quantity
-                if product.stock_quantity < new_quantity:
-                    app_logger.warning(f"Insufficient stock for product {product_id}: requested {new_quantity}, available {product.stock_quantity}")
-                    return False
-                
-                cart_item.quantity = new_quantity
-                app_logger.info(f"Updated cart item quantity: product {product_id}, new quantity {new_quantity}")
-            else:
-                # Add new item
-                cart_item = CartItem(
-                    cart_id=cart_id,
-                    product_id=product_id,
-                    quantity=quantity
-                )
-                self.db.add(cart_item)
-                app_logger.info(f"Added new item to cart: product {product_id}, quantity {quantity}")
-            
+            if result.rowcount == 0:
+                app_logger.warning(f"Insufficient stock for product {product_id}: cart quantity would exceed available {product.stock_quantity}")
+                self.db.rollback()
+                return False, self._count_items(cart_id)
+
+            app_logger.info(f"Added product {product_id} (quantity {quantity}) to cart {cart_id}")
+            new_count = self._sync_items_count(cart_id)
             self.db.commit()
-            return True
+            return True, new_count
         except Exception as e:
             app_logger.error(f"Error adding product {product_id} to cart {cart_id}: {e}")
             self.db.rollback()
-            return False
+            return False, 0
     
     def get_cart_items(self, cart_id: int) -> List[CartItem]:
         """Get all items in cart with product details"""
         try:
-            stmt = (
-                select(CartItem)
-                .where(CartItem.cart_id == cart_id)
-                .join(Product)
-                .where(Product.is_active == True)
-            )
-            result = self.db.execute(stmt)
-            return result.scalars().all()
+            return self.db.scalars(_SEL_CART_ITEMS, {"cart_id": cart_id}).all()
         except Exception as e:
             app_logger.error(f"Error getting cart items for cart {cart_id}: {e}")
             return []
+
+    def get_cart_items_with_products(self, cart_id: int) -> List[CartItem]:
+        """Get cart items with their products in a single JOIN query.
+
+        Same rows as get_cart_items, but one SELECT instead of two —
+        meant for the order-creation paths that fetch inside an open
+        transaction.
+        """
+        try:
+            return self.db.scalars(_SEL_CART_ITEMS_JOINED, {"cart_id": cart_id}).all()
+        except Exception as e:
+            app_logger.error(f"Error getting cart items for cart {cart_id}: {e}")
+            return []
+
+    def get_cart_view(self, cart_id: int) -> List[Row]:
+        """Get cart lines as (id, quantity, name, price, image_url) rows.
+
+        A pure column projection for the read paths that only render —
+        mutations keep using get_cart_items, which returns full ORM
+        objects.
+        """
+        try:
+            return self.db.execute(_SEL_CART_VIEW, {"cart_id": cart_id}).all()
+        except Exception as e:
+            app_logger.error(f"Error getting cart view for cart {cart_id}: {e}")
+            return []
     
     def get_cart_items_count(self, cart_id: int) -> int:
-        """Get total number of items in cart"""
+        """Get total number of items in cart.
+
+        Reads the denormalized counter maintained by the mutation
+        methods — a primary-key lookup instead of loading the items.
+        """
         try:
-            items = self.get_cart_items(cart_id)
-            return sum(item.quantity for item in items)
+            cart = self.db.get(Cart, cart_id)
+            return cart.items_count if cart else 0
         except Exception as e:
             app_logger.error(f"Error getting cart items count for cart {cart_id}: {e}")
             return 0
     
-    def update_cart_item_quantity(self, cart_item_id: int, quantity_change: int) -> bool:
-        """Update cart item quantity"""
+    def update_cart_item_quantity(self, cart_item_id: int, quantity_change: int) -> Tuple[bool, int]:
+        """Update cart item quantity.
+
+        Returns (success, new item count) computed in the same session.
+        """
         try:
             cart_item = self.db.get(CartItem, cart_item_id)
             if not cart_item:
-                return False
-            
+                return False, 0
+
+            cart_id = cart_item.cart_id
             new_quantity = cart_item.quantity + quantity_change
-            
+
             if new_quantity <= 0:
                 # Remove item if quantity becomes 0 or negative
                 self.db.delete(cart_item)
@@ -125,44 +234,58 @@ class CartService:
                 product = cart_item.product
                 if product.stock_quantity < new_quantity:
                     app_logger.warning(f"Insufficient stock for product {product.id}: requested {new_quantity}, available {product.stock_quantity}")
-                    return False
-                
+                    return False, self._count_items(cart_id)
+
                 cart_item.quantity = new_quantity
                 app_logger.info(f"Updated cart item {cart_item_id} quantity to {new_quantity}")
-            
+
+            self.db.flush()
+            new_count = self._sync_items_count(cart_id)
             self.db.commit()
-            return True
+            return True, new_count
         except Exception as e:
             app_logger.error(f"Error updating cart item {cart_item_id} quantity: {e}")
             self.db.rollback()
-            return False
-    
-    def remove_from_cart(self, cart_item_id: int) -> bool:
-        """Remove item from cart"""
+            return False, 0
+
+    def remove_from_cart(self, cart_item_id: int) -> Tuple[bool, int]:
+        """Remove item from cart.
+
+        Returns (success, new item count) computed in the same session.
+        """
         try:
             cart_item = self.db.get(CartItem, cart_item_id)
             if not cart_item:
-                return False
-            
+                return False, 0
+
+            cart_id = cart_item.cart_id
             self.db.delete(cart_item)
+            self.db.flush()
+            new_count = self._sync_items_count(cart_id)
             self.db.commit()
             app_logger.info(f"Removed cart item {cart_item_id}")
-            return True
+            return True, new_count
         except Exception as e:
             app_logger.error(f"Error removing cart item {cart_item_id}: {e}")
             self.db.rollback()
-            return False
+            return False, 0
     
     def clear_cart(self, cart_id: int) -> bool:
-        """Clear all items from cart"""
+        """Clear all items from cart.
+
+        A single bulk DELETE — no SELECT to materialize the rows and no
+        per-row ORM delete orchestration.
+        """
         try:
-            stmt = select(CartItem).where(CartItem.cart_id == cart_id)
-            result = self.db.execute(stmt)
-            cart_items = result.scalars().all()
-            
-            for item in cart_items:
-                self.db.delete(item)
-            
+            stmt = (
+                delete(CartItem)
+                .where(CartItem.cart_id == cart_id)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.execute(stmt)
+            cart = self.db.get(Cart, cart_id)
+            if cart:
+                cart.items_count = 0
             self.db.commit()
             app_logger.info(f"Cleared cart {cart_id}")
             return True
@@ -171,12 +294,19 @@ class CartService:
             self.db.rollback()
             return False
     
-    def get_cart_total(self, cart_id: int) -> float:
-        """Calculate total price of items in cart"""
+    def get_cart_summary(self, cart_id: int) -> Tuple[int, float]:
+        """Get (item count, total price) for a cart in one aggregate query.
+
+        The SUMs run in the database, so no CartItem or Product rows are
+        materialized just to be reduced in Python.
+        """
         try:
-            items = self.get_cart_items(cart_id)
-            total = sum(item.product.price * item.quantity for item in items)
-            return total
+            count, total = self.db.execute(_SEL_CART_SUMMARY, {"cart_id": cart_id}).one()
+            return count, total
         except Exception as e:
-            app_logger.error(f"Error calculating cart total for cart {cart_id}: {e}")
-            return 0.0
\ No newline at end of file
+            app_logger.error(f"Error getting cart summary for cart {cart_id}: {e}")
+            return 0, 0.0
+
+    def get_cart_total(self, cart_id: int) -> float:
+        """Calculate total price of items in cart"""
+        return self.get_cart_summary(cart_id)[1]
\ No newline at end of file
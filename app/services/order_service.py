@@ -1,8 +1,8 @@
 """Order service for managing purchase orders"""
 
-from sqlalchemy.orm import Session
-from sqlalchemy import select, and_
-from typing import List, Optional
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import Row, bindparam, select, insert, update, delete, and_
+from typing import Iterator, List, Optional
 from app.models.order import Order, OrderItem, OrderStatus
 from app.models.cart import Cart, CartItem
 from app.models.product import Product
@@ -10,18 +10,151 @@ from app.services.cart_service import CartService
 from app.services.product_service import ProductService
 from app.core.logging import app_logger
 
+# Fixed-shape hot statements are built once at import (same pattern as
+# the product and cart services); only bind values change per call
+_SEL_USER_ORDERS = (
+    select(Order)
+    .options(selectinload(Order.items).selectinload(OrderItem.product))
+    .where(Order.user_id == bindparam("user_id"))
+    .order_by(Order.created_at.desc())
+    .limit(bindparam("limit"))
+)
+
+_SEL_ORDERS_BY_STATUS = (
+    select(Order)
+    .where(Order.status == bindparam("status"))
+    .order_by(Order.created_at.desc())
+    .limit(bindparam("limit"))
+    .execution_options(yield_per=200)
+)
+
 class OrderService:
     """Service for order-related operations"""
     
     def __init__(self, db: Session):
         self.db = db
     
+    def checkout(self, user_id: int, cart_id: int, shipping_address: str, phone: str = None) -> Optional[Order]:
+        """Create an order from the cart and clear the cart atomically.
+
+        The cart row is locked with SELECT ... FOR UPDATE for the span
+        of a single transaction, so a double-submitted checkout cannot
+        order the same cart twice. Order creation, stock decrements and
+        the cart cleanup commit together instead of as separate
+        round-trips.
+        """
+        try:
+            cart = self.db.scalar(
+                select(Cart).where(Cart.id == cart_id).with_for_update()
+            )
+            if not cart:
+                app_logger.warning(f"Attempted to checkout non-existent cart {cart_id}")
+                return None
+
+            # One JOIN projection carries every value the checkout
+            # needs — no CartItem or Product ORM instances are
+            # materialized just to copy five fields off each
+            rows = self.db.execute(
+                select(
+                    CartItem.id,
+                    CartItem.product_id,
+                    CartItem.quantity,
+                    Product.price,
+                    Product.stock_quantity,
+                )
+                .join(Product, CartItem.product_id == Product.id)
+                .where(
+                    and_(
+                        CartItem.cart_id == cart_id,
+                        Product.is_active == True
+                    )
+                )
+            ).all()
+            if not rows:
+                app_logger.warning(f"Attempted to checkout empty cart {cart_id}")
+                self.db.rollback()
+                return None
+
+            # Lock every product row this checkout will decrement, in
+            # ascending id order so concurrent checkouts over
+            # overlapping carts acquire locks in the same sequence and
+            # cannot deadlock (no-op on SQLite, which locks the file)
+            product_ids = sorted({row.product_id for row in rows})
+            self.db.scalars(
+                select(Product)
+                .where(Product.id.in_(product_ids))
+                .order_by(Product.id)
+                .with_for_update()
+            ).all()
+
+            # Validate stock and compute the total in one pass before
+            # writing anything; decrement_stock_checked below re-checks
+            # under the lock, so this is the fast pre-check
+            total_amount = 0
+            for row in rows:
+                if row.stock_quantity < row.quantity:
+                    app_logger.warning(f"Insufficient stock for product {row.product_id}: requested {row.quantity}, available {row.stock_quantity}")
+                    self.db.rollback()
+                    return None
+                total_amount += row.price * row.quantity
+
+            order = Order(
+                user_id=user_id,
+                total_amount=total_amount,
+                status=OrderStatus.PENDING,
+                shipping_address=shipping_address,
+                phone=phone,
+                payment_method="Credit Card",  # Default for now
+                payment_status="pending"
+            )
+            self.db.add(order)
+            self.db.flush()  # Get order ID
+
+            # Move items onto the order with one multi-row INSERT,
+            # decrement stock with one guarded batch UPDATE and empty
+            # the cart with one bulk DELETE, all in this transaction
+            self.db.execute(
+                insert(OrderItem),
+                [
+                    {
+                        "order_id": order.id,
+                        "product_id": row.product_id,
+                        "quantity": row.quantity,
+                        "price": row.price,
+                    }
+                    for row in rows
+                ]
+            )
+
+            if not ProductService(self.db).decrement_stock_checked(
+                {row.product_id: row.quantity for row in rows}
+            ):
+                self.db.rollback()
+                return None
+
+            self.db.execute(
+                delete(CartItem)
+                .where(CartItem.cart_id == cart_id)
+                .execution_options(synchronize_session=False)
+            )
+            cart.items_count = 0
+            self.db.commit()
+
+            app_logger.info(f"Checked out cart {cart_id} as order {order.id} for user {user_id}, total: ${total_amount:.2f}")
+            return order
+        except Exception as e:
+            app_logger.error(f"Error checking out cart {cart_id}: {e}")
+            self.db.rollback()
+            return None
+
     def create_order_from_cart(self, user_id: int, cart_id: int, shipping_address: str, phone: str = None) -> Optional[Order]:
         """Create order from cart items"""
         try:
-            # Get cart items
+            # Items and products arrive in one JOIN query, so the
+            # per-item price/stock reads in the loops below stay in
+            # memory instead of lazy-loading row by row
             cart_service = CartService(self.db)
-            cart_items = cart_service.get_cart_items(cart_id)
+            cart_items = cart_service.get_cart_items_with_products(cart_id)
             
             if not cart_items:
                 app_logger.warning(f"Attempted to create order from empty cart {cart_id}")
@@ -62,23 +195,34 @@ class OrderService:
             self.db.add(order)
             self.db.flush()  # Get order ID
             
-            # Create order items and update stock
-            product_service = ProductService(self.db)
-            for item_data in order_items_data:
-                order_item = OrderItem(
-                    order_id=order.id,
-                    product_id=item_data['product_id'],
-                    quantity=item_data['quantity'],
-                    price=item_data['price']
-                )
-                self.db.add(order_item)
-                
-                # Update product stock
-                product_service.update_stock(item_data['product_id'], -item_data['quantity'])
-            
+            # Insert all order items with one multi-row Core INSERT and
+            # decrement all stock in a single batched statement, both
+            # inside this transaction
+            self.db.execute(
+                insert(OrderItem),
+                [
+                    {
+                        'order_id': order.id,
+                        'product_id': d['product_id'],
+                        'quantity': d['quantity'],
+                        'price': d['price']
+                    }
+                    for d in order_items_data
+                ]
+            )
+
+            # Guarded batch decrement: the stock check above is only a
+            # fast pre-check on possibly stale rows; this statement
+            # refuses any decrement past zero, so concurrent checkouts
+            # cannot oversell
+            if not ProductService(self.db).decrement_stock_checked(
+                {d['product_id']: d['quantity'] for d in order_items_data}
+            ):
+                self.db.rollback()
+                return None
+
             self.db.commit()
-            self.db.refresh(order)
-            
+
             app_logger.info(f"Created order {order.id} for user {user_id}, total: ${total_amount:.2f}")
             return order
             
@@ -88,84 +232,115 @@ class OrderService:
             return None
     
     def get_order(self, order_id: int) -> Optional[Order]:
-        """Get order by ID"""
+        """Get order by ID with items and their products preloaded.
+
+        selectinload keeps the queries flat (two extra IN selects) so
+        display and cancel paths read order.items[i].product without
+        per-row lazy loads.
+        """
         try:
-            return self.db.get(Order, order_id)
+            return self.db.get(
+                Order, order_id,
+                options=[selectinload(Order.items).selectinload(OrderItem.product)]
+            )
         except Exception as e:
             app_logger.error(f"Error getting order {order_id}: {e}")
             return None
-    
+
     def get_user_orders(self, user_id: int, limit: int = 50) -> List[Order]:
-        """Get all orders for a user"""
+        """Get all orders for a user, items and products preloaded"""
         try:
-            stmt = (
-                select(Order)
-                .where(Order.user_id == user_id)
-                .order_by(Order.created_at.desc())
-                .limit(limit)
-            )
-            result = self.db.execute(stmt)
-            return result.scalars().all()
+            return self.db.scalars(
+                _SEL_USER_ORDERS, {"user_id": user_id, "limit": limit}
+            ).all()
         except Exception as e:
             app_logger.error(f"Error getting orders for user {user_id}: {e}")
             return []
     
     def get_order_items(self, order_id: int) -> List[OrderItem]:
-        """Get all items in an order"""
+        """Get all items in an order with products preloaded.
+
+        joinedload folds the products into the same SELECT, so callers
+        read item.product without per-row lazy loads.
+        """
         try:
-            stmt = select(OrderItem).where(OrderItem.order_id == order_id)
-            result = self.db.execute(stmt)
-            return result.scalars().all()
+            stmt = (
+                select(OrderItem)
+                .options(joinedload(OrderItem.product))
+                .where(OrderItem.order_id == order_id)
+            )
+            return self.db.scalars(stmt).unique().all()
         except Exception as e:
             app_logger.error(f"Error getting order items for order {order_id}: {e}")
             return []
+
+    def _get_item_quantities(self, order_id: int) -> List[Row]:
+        """Get (product_id, quantity) tuples for an order's items.
+
+        The narrow projection for callers that only adjust stock — no
+        OrderItem objects, no product join.
+        """
+        return self.db.execute(
+            select(OrderItem.product_id, OrderItem.quantity)
+            .where(OrderItem.order_id == order_id)
+        ).all()
     
     def update_order_status(self, order_id: int, status: OrderStatus) -> bool:
-        """Update order status"""
+        """Update order status.
+
+        A single UPDATE; rowcount doubles as the existence check, so no
+        SELECT precedes the write.
+        """
         try:
-            order = self.get_order(order_id)
-            if not order:
+            result = self.db.execute(
+                update(Order)
+                .where(Order.id == order_id)
+                .values(status=status)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
                 return False
-            
-            old_status = order.status
-            order.status = status
-            self.db.commit()
-            
-            app_logger.info(f"Updated order {order_id} status from {old_status.value} to {status.value}")
+
+            app_logger.info(f"Updated order {order_id} status to {status.value}")
             return True
         except Exception as e:
             app_logger.error(f"Error updating order {order_id} status: {e}")
             self.db.rollback()
             return False
-    
+
     def update_payment_status(self, order_id: int, payment_status: str) -> bool:
         """Update order payment status"""
         try:
-            order = self.get_order(order_id)
-            if not order:
+            result = self.db.execute(
+                update(Order)
+                .where(Order.id == order_id)
+                .values(payment_status=payment_status)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
                 return False
-            
-            order.payment_status = payment_status
-            self.db.commit()
-            
+
             app_logger.info(f"Updated order {order_id} payment status to {payment_status}")
             return True
         except Exception as e:
             app_logger.error(f"Error updating order {order_id} payment status: {e}")
             self.db.rollback()
             return False
-    
+
     def add_tracking_number(self, order_id: int, tracking_number: str) -> bool:
-        """Add tracking number to order"""
+        """Add tracking number to order and mark it shipped"""
         try:
-            order = self.get_order(order_id)
-            if not order:
+            # Tracking number and the SHIPPED transition belong
+            # together, so they go in one statement
+            result = self.db.execute(
+                update(Order)
+                .where(Order.id == order_id)
+                .values(tracking_number=tracking_number, status=OrderStatus.SHIPPED)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
                 return False
-            
-            order.tracking_number = tracking_number
-            order.status = OrderStatus.SHIPPED
-            self.db.commit()
-            
+
             app_logger.info(f"Added tracking number {tracking_number} to order {order_id}")
             return True
         except Exception as e:
@@ -174,27 +349,44 @@ class OrderService:
             return False
     
     def cancel_order(self, order_id: int) -> bool:
-        """Cancel an order and restore stock"""
+        """Cancel an order and restore stock.
+
+        The cancellable-status check rides in the UPDATE's WHERE clause,
+        so the transition is atomic — an order that ships between a
+        caller's read and this write is simply not matched (rowcount 0)
+        rather than cancelled after the fact. No SELECT of the order
+        precedes the write.
+        """
         try:
-            order = self.get_order(order_id)
-            if not order:
+            result = self.db.execute(
+                update(Order)
+                .where(
+                    and_(
+                        Order.id == order_id,
+                        Order.status.not_in([OrderStatus.SHIPPED, OrderStatus.DELIVERED])
+                    )
+                )
+                .values(status=OrderStatus.CANCELLED)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
+                app_logger.warning(f"Cannot cancel order {order_id}: missing or already shipped/delivered")
+                self.db.rollback()
                 return False
-            
-            if order.status in [OrderStatus.SHIPPED, OrderStatus.DELIVERED]:
-                app_logger.warning(f"Cannot cancel order {order_id} with status {order.status.value}")
+
+            # Restore stock for all items in one batched statement; the
+            # tuple helper pulls just (product_id, quantity) instead of
+            # materializing OrderItem objects. A failed restore rolls
+            # back the status flip too — the cancellation and its stock
+            # return succeed or fail together.
+            if not ProductService(self.db).bulk_adjust_stock(
+                dict(self._get_item_quantities(order_id))
+            ):
+                app_logger.error(f"Stock restore failed cancelling order {order_id}, rolling back")
+                self.db.rollback()
                 return False
-            
-            # Restore stock for all items
-            product_service = ProductService(self.db)
-            order_items = self.get_order_items(order_id)
-            
-            for item in order_items:
-                product_service.update_stock(item.product_id, item.quantity)
-            
-            # Update order status
-            order.status = OrderStatus.CANCELLED
+
             self.db.commit()
-            
             app_logger.info(f"Cancelled order {order_id} and restored stock")
             return True
         except Exception as e:
@@ -202,31 +394,32 @@ class OrderService:
             self.db.rollback()
             return False
     
-    def get_all_orders(self, limit: int = 100) -> List[Order]:
-        """Get all orders (admin function)"""
+    def get_all_orders(self, limit: int = 100) -> Iterator[Order]:
+        """Iterate all orders (admin function).
+
+        yield_per streams rows in batches of 200 instead of
+        materializing the whole result up front, so an admin export
+        over a large order table holds one batch in memory at a time.
+        Callers that need a list can wrap in list(...).
+        """
         try:
             stmt = (
                 select(Order)
                 .order_by(Order.created_at.desc())
                 .limit(limit)
+                .execution_options(yield_per=200)
             )
-            result = self.db.execute(stmt)
-            return result.scalars().all()
+            return self.db.scalars(stmt)
         except Exception as e:
             app_logger.error(f"Error getting all orders: {e}")
-            return []
-    
-    def get_orders_by_status(self, status: OrderStatus, limit: int = 100) -> List[Order]:
-        """Get orders by status"""
+            return iter(())
+
+    def get_orders_by_status(self, status: OrderStatus, limit: int = 100) -> Iterator[Order]:
+        """Iterate orders by status, streamed in batches like get_all_orders"""
         try:
-            stmt = (
-                select(Order)
-                .where(Order.status == status)
-                .order_by(Order.created_at.desc())
-                .limit(limit)
+            return self.db.scalars(
+                _SEL_ORDERS_BY_STATUS, {"status": status, "limit": limit}
             )
-            result = self.db.execute(stmt)
-            return result.scalars().all()
         except Exception as e:
             app_logger.error(f"Error getting orders by status {status.value}: {e}")
-            return []
\ No newline at end of file
+            return iter(())
\ No newline at end of file
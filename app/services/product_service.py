@@ -1,11 +1,60 @@
 """Product service for managing product operations"""
 
-from sqlalchemy.orm import Session
-from sqlalchemy import select, or_, and_
-from typing import List, Optional
+import time
+
+from sqlalchemy.orm import Session, load_only, undefer_group
+from sqlalchemy import bindparam, case, select, text, update, or_, and_
+from typing import Dict, List, Optional, Tuple
 from app.models.product import Product, Category
+from app.core import product_cache
 from app.core.logging import app_logger
 
+# Featured and category listings are read-mostly and low-cardinality,
+# so they are served from small in-process TTL caches (monotonic
+# timestamp per entry, same pattern as HealthCheck). Sessions are built
+# with expire_on_commit=False, so the cached detached objects stay
+# readable. Product writes clear the caches via clear_product_caches.
+_CACHE_TTL = 60.0
+_featured_cache: Dict[int, Tuple[float, List[Product]]] = {}
+_category_cache: Dict[Tuple, Tuple[float, List[Product]]] = {}
+_categories_cache: Dict[str, Tuple[float, List[Category]]] = {}
+
+def clear_product_caches() -> None:
+    """Drop cached listings after a product write"""
+    _featured_cache.clear()
+    _category_cache.clear()
+    _categories_cache.clear()
+
+# Cleared on the first failed FTS query so an FTS-less SQLite build
+# pays the exception once, not per search
+_fts_available = True
+
+# Fixed-shape hot statements are built once at import; only bind values
+# change per call, so Core construction work isn't repeated and the
+# engine's query cache always gets an identical cache key
+
+# Listing queries fetch only the columns the product cards render;
+# description/specifications are already deferred at the model, and
+# load_only additionally skips sku, category_id, the flags and the
+# timestamps. The detail page goes through get_product, which loads
+# the full row.
+_CARD_COLUMNS = load_only(
+    Product.id, Product.name, Product.price,
+    Product.image_url, Product.stock_quantity,
+)
+
+_FEATURED_STMT = (
+    select(Product)
+    .options(_CARD_COLUMNS)
+    .where(
+        and_(
+            Product.is_featured == True,
+            Product.is_active == True
+        )
+    )
+    .limit(bindparam("limit"))
+)
+
 class ProductService:
     """Service for product-related operations"""
     
@@ -13,29 +62,83 @@ class ProductService:
         self.db = db
     
     def get_product(self, product_id: int) -> Optional[Product]:
-        """Get product by ID"""
+        """Get product by ID with full details.
+
+        Undefers the "details" column group (description,
+        specifications) since this feeds the detail page; listing
+        queries leave those text columns unloaded.
+        """
         try:
-            return self.db.get(Product, product_id)
+            return self.db.get(Product, product_id, options=[undefer_group("details")])
         except Exception as e:
             app_logger.error(f"Error getting product {product_id}: {e}")
             return None
     
-    def get_products_by_category(self, category_name: str, limit: int = 50) -> List[Product]:
-        """Get products by category name"""
+    # Sort keys the UI may request, mapped to SQL orderings
+    _ORDER_BY = {
+        "name_asc": Product.name.asc(),
+        "name_desc": Product.name.desc(),
+        "price_asc": Product.price.asc(),
+        "price_desc": Product.price.desc(),
+    }
+
+    def get_products_by_category(self, category_name: str, limit: int = 24, after_id: int = 0,
+                                 price_min: Optional[float] = None,
+                                 price_max: Optional[float] = None,
+                                 order_by: Optional[str] = None) -> List[Product]:
+        """Get products by category name.
+
+        Price bounds and ordering are pushed into the SQL predicate so
+        the database filters on its (category_id, price) index and only
+        matching rows cross the wire. Pages with a keyset cursor: pass
+        the id of the last product of the previous page as after_id to
+        fetch the next page. The cursor applies to the default id
+        ordering only; an explicit order_by returns a single page.
+        """
         try:
+            # Only the unfiltered first page is cached: that's where
+            # the hit rate is, and it bounds the cache at one entry per
+            # (category, limit). Keying on every cursor and filter
+            # combination would grow without limit — entries are
+            # overwritten on expiry, never evicted — leaking a page of
+            # detached products per distinct "Load More" click.
+            cacheable = (
+                after_id == 0 and price_min is None
+                and price_max is None and order_by is None
+            )
+            cache_key = (category_name.lower(), limit)
+            if cacheable:
+                cached = _category_cache.get(cache_key)
+                if cached and time.monotonic() - cached[0] < _CACHE_TTL:
+                    return cached[1]
+
+            conditions = [
+                Category.name.ilike(f"%{category_name}%"),
+                Product.is_active == True,
+            ]
+            if price_min is not None:
+                conditions.append(Product.price >= price_min)
+            if price_max is not None:
+                conditions.append(Product.price <= price_max)
+
+            if order_by in self._ORDER_BY:
+                ordering = self._ORDER_BY[order_by]
+            else:
+                conditions.append(Product.id > after_id)
+                ordering = Product.id
+
             stmt = (
                 select(Product)
+                .options(_CARD_COLUMNS)
                 .join(Category)
-                .where(
-                    and_(
-                        Category.name.ilike(f"%{category_name}%"),
-                        Product.is_active == True
-                    )
-                )
+                .where(and_(*conditions))
+                .order_by(ordering)
                 .limit(limit)
             )
-            result = self.db.execute(stmt)
-            return result.scalars().all()
+            products = self.db.scalars(stmt).all()
+            if cacheable:
+                _category_cache[cache_key] = (time.monotonic(), products)
+            return products
         except Exception as e:
             app_logger.error(f"Error getting products by category {category_name}: {e}")
             return []
@@ -43,28 +146,61 @@ class ProductService:
     def get_featured_products(self, limit: int = 8) -> List[Product]:
         """Get featured products"""
         try:
-            stmt = (
-                select(Product)
-                .where(
-                    and_(
-                        Product.is_featured == True,
-                        Product.is_active == True
-                    )
-                )
-                .limit(limit)
-            )
-            result = self.db.execute(stmt)
-            return result.scalars().all()
+            cached = _featured_cache.get(limit)
+            if cached and time.monotonic() - cached[0] < _CACHE_TTL:
+                return cached[1]
+
+            products = self.db.scalars(_FEATURED_STMT, {"limit": limit}).all()
+            _featured_cache[limit] = (time.monotonic(), products)
+            return products
         except Exception as e:
             app_logger.error(f"Error getting featured products: {e}")
             return []
     
-    def search_products(self, query: str, limit: int = 50) -> List[Product]:
-        """Search products by name or description"""
+    def search_products(self, query: str, limit: int = 24, after_id: int = 0) -> List[Product]:
+        """Search products by name, description or specifications.
+
+        Prefers the FTS5 index (an indexed MATCH instead of scanning
+        three text columns per request) and falls back to ILIKE when
+        the index isn't available. Pages with the same id keyset cursor
+        as category listings, so each additional page of results is a
+        bounded read instead of re-fetching the whole match set.
+        """
+        global _fts_available
+        if _fts_available:
+            try:
+                # Quote the query so user input is a phrase term, not
+                # FTS5 operator syntax
+                match = '"' + query.replace('"', '""') + '"'
+                stmt = (
+                    select(Product)
+                    .options(_CARD_COLUMNS)
+                    .where(
+                        and_(
+                            Product.id.in_(
+                                text("SELECT rowid FROM products_fts WHERE products_fts MATCH :match")
+                                .bindparams(match=match)
+                            ),
+                            Product.is_active == True,
+                            Product.id > after_id
+                        )
+                    )
+                    .order_by(Product.id)
+                    .limit(limit)
+                )
+                return self.db.scalars(stmt).all()
+            except Exception as e:
+                # Missing FTS table or an FTS-less SQLite build: drop to
+                # the ILIKE path for the rest of the process lifetime
+                _fts_available = False
+                self.db.rollback()
+                app_logger.info(f"FTS search unavailable, falling back to ILIKE: {e}")
+
         try:
             search_term = f"%{query}%"
             stmt = (
                 select(Product)
+                .options(_CARD_COLUMNS)
                 .where(
                     and_(
                         or_(
@@ -72,13 +208,14 @@ class ProductService:
                             Product.description.ilike(search_term),
                             Product.specifications.ilike(search_term)
                         ),
-                        Product.is_active == True
+                        Product.is_active == True,
+                        Product.id > after_id
                     )
                 )
+                .order_by(Product.id)
                 .limit(limit)
             )
-            result = self.db.execute(stmt)
-            return result.scalars().all()
+            return self.db.scalars(stmt).all()
         except Exception as e:
             app_logger.error(f"Error searching products with query '{query}': {e}")
             return []
@@ -88,6 +225,7 @@ class ProductService:
         try:
             stmt = (
                 select(Product)
+                .options(_CARD_COLUMNS)
                 .where(
                     and_(
                         Product.price >= min_price,
@@ -97,18 +235,26 @@ class ProductService:
                 )
                 .limit(limit)
             )
-            result = self.db.execute(stmt)
-            return result.scalars().all()
+            return self.db.scalars(stmt).all()
         except Exception as e:
             app_logger.error(f"Error getting products by price range {min_price}-{max_price}: {e}")
             return []
     
     def get_all_categories(self) -> List[Category]:
-        """Get all product categories"""
+        """Get all product categories.
+
+        Read on nearly every page render but effectively static, so the
+        list is served from the same TTL cache as the other listings.
+        """
         try:
+            cached = _categories_cache.get("all")
+            if cached and time.monotonic() - cached[0] < _CACHE_TTL:
+                return cached[1]
+
             stmt = select(Category)
-            result = self.db.execute(stmt)
-            return result.scalars().all()
+            categories = self.db.scalars(stmt).all()
+            _categories_cache["all"] = (time.monotonic(), categories)
+            return categories
         except Exception as e:
             app_logger.error(f"Error getting categories: {e}")
             return []
@@ -119,7 +265,7 @@ class ProductService:
             product = Product(**product_data)
             self.db.add(product)
             self.db.commit()
-            self.db.refresh(product)
+            clear_product_caches()
             app_logger.info(f"Created product: {product.name}")
             return product
         except Exception as e:
@@ -138,8 +284,9 @@ class ProductService:
                 if hasattr(product, key):
                     setattr(product, key, value)
             
-            self.db.commit()
-            self.db.refresh(product)
+            self.db.flush()
+            clear_product_caches()
+            product_cache.invalidate(product_id)
             app_logger.info(f"Updated product: {product.name}")
             return product
         except Exception as e:
@@ -155,7 +302,9 @@ class ProductService:
                 return False
             
             product.is_active = False
-            self.db.commit()
+            self.db.flush()
+            clear_product_caches()
+            product_cache.invalidate(product_id)
             app_logger.info(f"Deleted product: {product.name}")
             return True
         except Exception as e:
@@ -163,6 +312,74 @@ class ProductService:
             self.db.rollback()
             return False
     
+    def bulk_adjust_stock(self, changes: Dict[int, int]) -> bool:
+        """Apply relative stock changes for many products in one statement.
+
+        changes maps product id to a signed delta. One UPDATE carries a
+        per-product CASE for the deltas (same shape as
+        decrement_stock_checked), run within the caller's transaction —
+        no commit here, so an order's stock changes land atomically
+        with the order itself.
+        """
+        try:
+            if not changes:
+                return True
+
+            delta_case = case(changes, value=Product.id)
+            stmt = (
+                update(Product)
+                .where(Product.id.in_(sorted(changes)))
+                .values(stock_quantity=Product.stock_quantity + delta_case)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.execute(stmt)
+            clear_product_caches()
+            for pid in changes:
+                product_cache.invalidate(pid)
+            return True
+        except Exception as e:
+            app_logger.error(f"Error bulk-adjusting stock: {e}")
+            return False
+
+    def decrement_stock_checked(self, quantities: Dict[int, int]) -> bool:
+        """Atomically decrement stock for many products, refusing oversell.
+
+        quantities maps product id to the amount to subtract. One UPDATE
+        carries a per-product CASE for the amounts and a
+        stock_quantity >= amount guard in its WHERE clause, so a row
+        whose stock ran out between the caller's read and this write is
+        simply not updated — no read-check-write race. RETURNING
+        reports which rows were updated; if any product fell short the
+        caller should roll back. Ids are ordered ascending for a
+        deterministic lock sequence. No commit here.
+        """
+        try:
+            if not quantities:
+                return True
+
+            ids = sorted(quantities)
+            qty_case = case(quantities, value=Product.id)
+            stmt = (
+                update(Product)
+                .where(and_(Product.id.in_(ids), Product.stock_quantity >= qty_case))
+                .values(stock_quantity=Product.stock_quantity - qty_case)
+                .returning(Product.id)
+                .execution_options(synchronize_session=False)
+            )
+            updated = set(self.db.scalars(stmt).all())
+            if len(updated) != len(ids):
+                short = [pid for pid in ids if pid not in updated]
+                app_logger.warning(f"Insufficient stock for products {short}")
+                return False
+
+            clear_product_caches()
+            for pid in ids:
+                product_cache.invalidate(pid)
+            return True
+        except Exception as e:
+            app_logger.error(f"Error decrementing stock: {e}")
+            return False
+
     def update_stock(self, product_id: int, quantity_change: int) -> bool:
         """Update product stock quantity"""
         try:
@@ -176,7 +393,9 @@ class ProductService:
                 return False
             
             product.stock_quantity = new_quantity
-            self.db.commit()
+            self.db.flush()
+            clear_product_caches()
+            product_cache.invalidate(product_id)
             app_logger.info(f"Updated stock for product {product.name}: {product.stock_quantity}")
             return True
         except Exception as e:
@@ -105,6 +105,15 @@ except ImportError as e:
 
 # Create FastAPI app outside the if block so it can be imported by uvicorn
 from fastapi import FastAPI, APIRouter
+
+# Prefer orjson-backed responses app-wide; it serializes straight to
+# bytes and is several times faster than stdlib json.dumps
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponseClass
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponseClass
+
 from app.core import (
     settings, 
     app_logger, 
@@ -123,6 +132,7 @@ app = FastAPI(
     version=settings.APP_VERSION,
     docs_url=f"{settings.API_PREFIX}/docs" if settings.API_PREFIX else "/docs",
     redoc_url=f"{settings.API_PREFIX}/redoc" if settings.API_PREFIX else "/redoc",
+    default_response_class=DefaultResponseClass,
 )
 
 # Set up error handlers
@@ -3,6 +3,7 @@ import sys
 import subprocess
 import platform
 import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Minimum Python version required
@@ -51,18 +52,64 @@ def create_venv():
         print(f"Error creating virtual environment: {e}")
         return False
 
-def install_dependencies():
-    """Install dependencies from requirements.txt."""
-    print("Installing dependencies...")
-    
+# Wheels pre-downloaded here feed an offline install
+WHEEL_CACHE_DIR = Path(".wheelcache")
+
+def download_wheels():
+    """Pre-download wheels into the local cache with the host pip.
+
+    Only needs network and disk — not the venv — so main() runs it
+    concurrently with create_venv. Returns True when the cache is
+    complete and the install can run offline against it.
+    """
+    lock_path = Path("requirements.lock")
+    requirements = str(lock_path) if lock_path.exists() else "requirements.txt"
+    try:
+        subprocess.run(
+            [sys.executable, "-m", "pip", "download", "-q",
+             "-d", str(WHEEL_CACHE_DIR), "-r", requirements],
+            check=True
+        )
+        return True
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"Wheel pre-download failed, will install online: {e}")
+        return False
+
+def install_dependencies(offline=False):
+    """Install dependencies, preferring a hashed lock file.
+
+    When requirements.lock exists (pip-compile --generate-hashes
+    output), installing from it with --require-hashes --no-deps skips
+    pip's dependency resolver entirely — every pin is exact, so there
+    is nothing to resolve — and --only-binary=:all: avoids source
+    builds. Falls back to the regular requirements.txt resolve when no
+    lock file is present.
+    """
     # Determine the path to the pip executable in the virtual environment
     if platform.system() == "Windows":
         pip_path = Path("venv") / "Scripts" / "pip"
     else:
         pip_path = Path("venv") / "bin" / "pip"
-    
+
+    lock_path = Path("requirements.lock")
+    if lock_path.exists():
+        print("Installing dependencies from requirements.lock...")
+        install_cmd = [
+            str(pip_path), "install",
+            "--require-hashes", "--no-deps", "--only-binary=:all:",
+            "-r", str(lock_path),
+        ]
+    else:
+        print("Installing dependencies from requirements.txt...")
+        install_cmd = [str(pip_path), "install", "-r", "requirements.txt"]
+
+    # With a complete wheel cache from download_wheels, the install is
+    # pure local disk I/O — no index round-trips
+    if offline:
+        install_cmd += ["--no-index", f"--find-links={WHEEL_CACHE_DIR}"]
+
     try:
-        subprocess.run([str(pip_path), "install", "-r", "requirements.txt"], check=True)
+        subprocess.run(install_cmd, check=True)
         print("Dependencies installed successfully.")
         return True
     except subprocess.CalledProcessError as e:
@@ -79,29 +126,47 @@ def verify_critical_dependencies():
     else:
         python_path = Path("venv") / "bin" / "python"
     
+    # One interpreter launch checks every dependency: a small script
+    # prints one "name:version" (or "name:MISSING") line per package.
+    # importlib.metadata reads the installed distribution's metadata
+    # instead of importing the package, so the check doesn't pay each
+    # framework's import-time initialization just to learn a version.
+    check_script = (
+        "from importlib.metadata import version, PackageNotFoundError\n"
+        "for dep in " + repr(CRITICAL_DEPENDENCIES) + ":\n"
+        "    try:\n"
+        "        print(dep + ':' + version(dep))\n"
+        "    except PackageNotFoundError:\n"
+        "        print(dep + ':MISSING')\n"
+    )
+
     missing_deps = []
     installed_versions = {}
-    
-    for dep in CRITICAL_DEPENDENCIES:
-        try:
-            # Use the virtual environment's Python to check for the dependency and its version
-            result = subprocess.run(
-                [str(python_path), "-c", f"import {dep}; print('{dep}:' + getattr({dep}, '__version__', 'unknown'))"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            version_output = result.stdout.strip()
-            if ':' in version_output:
-                dep_name, version = version_output.split(':', 1)
-                installed_versions[dep_name] = version
-                print(f"✓ {dep} is installed (version {version})")
-            else:
-                print(f"✓ {dep} is installed (version unknown)")
-        except subprocess.CalledProcessError:
-            missing_deps.append(dep)
-            print(f"✗ {dep} is missing")
-    
+
+    try:
+        result = subprocess.run(
+            [str(python_path), "-c", check_script],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+    except subprocess.CalledProcessError as e:
+        print(f"Error checking dependencies: {e}")
+        return False
+
+    for line in result.stdout.strip().splitlines():
+        if ':' not in line:
+            continue
+        dep_name, version = line.split(':', 1)
+        if version == 'MISSING':
+            missing_deps.append(dep_name)
+            print(f"✗ {dep_name} is missing")
+        elif version == 'unknown':
+            print(f"✓ {dep_name} is installed (version unknown)")
+        else:
+            installed_versions[dep_name] = version
+            print(f"✓ {dep_name} is installed (version {version})")
+
     if missing_deps:
         print("\nWarning: Some critical dependencies are missing:")
         for dep in missing_deps:
@@ -158,10 +223,19 @@ def main():
     if not check_python_version():
         return False
     
-    if not create_venv():
+    # Venv creation and the wheel download are independent — the
+    # download runs under the host interpreter's pip — so the two
+    # slowest steps of a cold setup overlap
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        venv_future = pool.submit(create_venv)
+        wheels_future = pool.submit(download_wheels)
+        venv_ok = venv_future.result()
+        wheels_ok = wheels_future.result()
+
+    if not venv_ok:
         return False
-    
-    if not install_dependencies():
+
+    if not install_dependencies(offline=wheels_ok):
         return False
     
     if not verify_critical_dependencies():